@@ -0,0 +1,48 @@
+"""
+Trim articles before they go into the script prompt.
+
+LLM latency and cost scale with input tokens, so each article body is
+capped to a token budget and near-duplicate wire stories (same lead
+paragraph syndicated by several outlets) are sent only once.
+"""
+
+try:
+    import tiktoken
+    _encoding = tiktoken.encoding_for_model("gpt-4o-mini")
+except Exception:
+    _encoding = None
+
+CONTENT_TOKEN_BUDGET = 400
+DUPLICATE_THRESHOLD = 0.8
+LEAD_CHARS = 200
+SHINGLE_SIZE = 5
+
+# Rough chars-per-token ratio for English when tiktoken is unavailable
+_CHARS_PER_TOKEN = 4
+
+
+def truncate_tokens(text, n=CONTENT_TOKEN_BUDGET):
+    """Cut `text` to at most `n` tokens"""
+    if _encoding is None:
+        limit = n * _CHARS_PER_TOKEN
+        return text[:limit] if len(text) > limit else text
+    tokens = _encoding.encode(text)
+    return _encoding.decode(tokens[:n]) if len(tokens) > n else text
+
+
+def _lead_shingles(article):
+    lead = " ".join((article.get("content") or article.get("summary") or article.get("title") or "").lower().split())
+    lead = lead[:LEAD_CHARS]
+    return {lead[i:i + SHINGLE_SIZE] for i in range(max(len(lead) - SHINGLE_SIZE + 1, 1))}
+
+
+def dedupe_articles(articles, threshold=DUPLICATE_THRESHOLD):
+    """Drop articles whose lead overlaps an earlier one with Jaccard similarity above `threshold`"""
+    kept, seen = [], []
+    for article in articles:
+        shingles = _lead_shingles(article)
+        if any(len(shingles & other) / len(shingles | other) > threshold for other in seen):
+            continue
+        kept.append(article)
+        seen.append(shingles)
+    return kept
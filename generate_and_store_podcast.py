@@ -6,10 +6,12 @@ Audio files are served locally for development.
 """
 
 import asyncio
+import json
 import os
 import sys
 from pathlib import Path
-from datetime import datetime, date
+from contextlib import aclosing
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -20,8 +22,16 @@ sys.path.append(str(Path(__file__).parent / "news-report"))
 
 from elevenlabs.client import ElevenLabs
 from openai import AsyncOpenAI
+import httpx
+import orjson
 import uuid
 
+import script_cache
+from podcast_pipeline import (
+    MODEL_ID, OUTPUT_FORMAT, TTS_LATENCY, VOICE_ID,
+    audio_duration_seconds, batch_sentences, chat_request, record_sentences, stream_script_sentences, tts_cache_key
+)
+
 # Configuration
 INSFORGE_BASE_URL = os.getenv("INSFORGE_BASE_URL", "https://sv7kpi43.us-east.insforge.app")
 INSFORGE_API_KEY = os.getenv("INSFORGE_API_KEY")
@@ -32,37 +42,25 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 elevenlabs_client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
 openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
 
+# Shared InsForge client so every database call reuses one pooled connection
+http_client = httpx.AsyncClient(
+    base_url=INSFORGE_BASE_URL,
+    headers={
+        "apikey": INSFORGE_API_KEY,
+        "Authorization": f"Bearer {INSFORGE_API_KEY}"
+    },
+    http2=True,
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+)
 
-def create_news_prompt(articles):
-    """Format articles into a news anchor script prompt"""
-    articles_text = ""
-    for i, article in enumerate(articles, 1):
-        source = article.get("source_name", "Unknown")
-        content = article.get("content") or article.get("summary") or "No content available"
-
-        articles_text += f"""
-Story {i}: {article['title']}
-Source: {source}
-Content: {content}
----
-"""
-
-    return f"""You are a professional news anchor creating a 2-3 minute broadcast script.
-
-Create a politically neutral, natural and engaging news broadcast from these {len(articles)} top stories:
-
-{articles_text}
-
-Requirements:
-- Start with a warm greeting and introduction (Your company: Neutral Network)
-- This is a monologue, so never need to label who is saying what (i.e. no need to say Anchor: text, just say text)
-- No settings or exposition (no need to say intro music, outro music, etc.)
-- Present each story in a conversational, professional tone
-- Use smooth transitions between stories
-- Keep it concise but informative
-- End with a brief closing statement
+# Nightly runs can use the OpenAI Batch API (half price, slower); fall back
+# to realtime generation if the batch has not finished by the deadline
+USE_BATCH_API = os.getenv("USE_BATCH_API") == "1"
+BATCH_DEADLINE_SECONDS = int(os.getenv("BATCH_DEADLINE_SECONDS", "3600"))
 
-The complete script"""
+# Local TTS audio keyed by content hash
+TTS_CACHE_DIR = Path(__file__).parent / "news-report" / "audio-data" / "tts-cache"
 
 
 async def fetch_articles():
@@ -117,106 +115,225 @@ async def fetch_articles():
     return mock_articles
 
 
+SYSTEM_MESSAGE = {"role": "system", "content": "You are a professional news anchor writer."}
+
+
 async def generate_script(articles):
-    """Generate news script using OpenAI GPT-5-mini"""
+    """Generate news script using OpenAI GPT-5-mini (reusing a cached script when possible)"""
     print("🤖 Generating news anchor script with OpenAI GPT-5-mini...")
 
-    prompt = create_news_prompt(articles)
+    async def _generate():
+        response = await openai_client.chat.completions.create(**chat_request(articles, SYSTEM_MESSAGE))
+        return response.choices[0].message.content.strip()
+
+    script = await script_cache.get_or_generate(openai_client, articles, _generate)
+    print(f"✓ Script generated ({len(script)} characters)")
+    return script
 
-    response = await openai_client.chat.completions.create(
-        model="gpt-5-mini",
-        messages=[
-            {"role": "system", "content": "You are a professional news anchor writer."},
-            {"role": "user", "content": prompt}
-        ]
-    )
 
-    script = response.choices[0].message.content.strip()
+async def submit_script_batch(articles, poll_interval=30, max_poll_interval=600):
+    """Generate the script through the OpenAI Batch API (half the cost, up to 24h turnaround)"""
+    print("🤖 Submitting script request to the OpenAI Batch API...")
+
+    line = json.dumps({
+        "custom_id": "script",
+        "method": "POST",
+        "url": "/v1/chat/completions",
+        "body": chat_request(articles, SYSTEM_MESSAGE)
+    })
+    batch_input = await openai_client.files.create(
+        file=("batch_input.jsonl", line.encode()),
+        purpose="batch"
+    )
+    job = await openai_client.batches.create(
+        input_file_id=batch_input.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    print(f"✓ Batch job created: {job.id}")
+
+    try:
+        while job.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, max_poll_interval)
+            job = await openai_client.batches.retrieve(job.id)
+            print(f"  Batch status: {job.status}")
+    except asyncio.CancelledError:
+        # Caller gave up (deadline); don't leave the job running
+        await openai_client.batches.cancel(job.id)
+        raise
+
+    if job.status != "completed" or not job.output_file_id:
+        raise RuntimeError(f"Batch job {job.id} ended with status {job.status}")
+
+    output = await openai_client.files.content(job.output_file_id)
+    item = json.loads(output.text.strip().splitlines()[0])
+    script = item["response"]["body"]["choices"][0]["message"]["content"].strip()
+
+    await asyncio.to_thread(script_cache.put, script_cache.cache_key(articles), script)
     print(f"✓ Script generated ({len(script)} characters)")
     return script
 
 
-def generate_audio(script):
-    """Convert script to audio using ElevenLabs"""
+async def generate_script_batch(articles, deadline=BATCH_DEADLINE_SECONDS):
+    """Generate one script through the Batch API, falling back to realtime on failure or timeout"""
+    cached = await asyncio.to_thread(script_cache.get_exact, script_cache.cache_key(articles))
+    if cached is not None:
+        script_cache.record("exact", cached)
+        return cached
+
+    try:
+        return await asyncio.wait_for(submit_script_batch(articles), timeout=deadline)
+    except Exception as e:
+        print(f"⚠️ Batch generation failed ({e!r}), falling back to realtime")
+        return await generate_script(articles)
+
+
+def write_chunks(path, chunks):
+    """Write `chunks` to `path` with gather I/O (one writev per IOV_MAX chunks) instead of a write per chunk"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        pending = [memoryview(c) for c in chunks]
+        i = 0
+        while i < len(pending):
+            batch = pending[i:i + 1024]
+            written = os.writev(fd, batch) if hasattr(os, "writev") else os.write(fd, batch[0])
+            # Skip fully written chunks and trim a partially written one
+            while i < len(pending) and written >= len(pending[i]):
+                written -= len(pending[i])
+                i += 1
+            if written:
+                pending[i] = pending[i][written:]
+    finally:
+        os.close(fd)
+
+
+async def generate_audio(sentences, chunk_chars=700):
+    """Convert streamed script sentences to audio using ElevenLabs as they arrive.
+
+    Sentences that queue up while a TTS request is running are sent together
+    in the next request (up to ~`chunk_chars` characters). Sentences already
+    in the TTS cache are never merged into a batch, so their audio is reused.
+    """
     print("🎙️ Generating audio with ElevenLabs...")
 
     # Save to file
     output_dir = Path(__file__).parent / "news-report" / "audio-data"
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # UTC, like the episode row and the uploaded object
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
     audio_file = output_dir / f"podcast_{timestamp}.mp3"
 
-    # Generate audio using correct API
-    audio_stream = elevenlabs_client.text_to_speech.convert(
-        text=script,
-        voice_id="UgBBYS2sOqTuMpoF3BR0",  # Professional male voice
-        model_id="eleven_multilingual_v2",
-        output_format="mp3_44100_128"
-    )
+    def _is_cached(text):
+        return (TTS_CACHE_DIR / f"{tts_cache_key(text)}.mp3").exists()
+
+    def _synthesize(text, f):
+        """Write the audio for `text` to `f`, returning the number of bytes written"""
+        # Reuse audio already synthesized for identical text
+        cache_file = TTS_CACHE_DIR / f"{tts_cache_key(text)}.mp3"
+        if cache_file.exists():
+            return f.write(cache_file.read_bytes())
+
+        # Generate audio using correct API
+        audio_stream = elevenlabs_client.text_to_speech.stream(
+            text=text,
+            voice_id=VOICE_ID,
+            model_id=MODEL_ID,
+            output_format=OUTPUT_FORMAT,
+            optimize_streaming_latency=TTS_LATENCY
+        )
+
+        # Write audio chunks to file (and to the cache)
+        chunks = [chunk for chunk in audio_stream if chunk]
+        f.writelines(chunks)
+        TTS_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".part")
+        write_chunks(tmp_file, chunks)
+        tmp_file.replace(cache_file)
+        return sum(len(chunk) for chunk in chunks)
 
-    # Write audio chunks to file
+    audio_size = 0
     with open(audio_file, "wb") as f:
-        for chunk in audio_stream:
-            if chunk:
-                f.write(chunk)
+        async with aclosing(batch_sentences(sentences, _is_cached, chunk_chars)) as batches:
+            async for text in batches:
+                # The ElevenLabs SDK is blocking, so run it off the event loop
+                audio_size += await asyncio.to_thread(_synthesize, text, f)
 
-    file_size_mb = audio_file.stat().st_size / (1024 * 1024)
     print(f"✓ Audio generated: {audio_file}")
-    print(f"  File size: {file_size_mb:.2f} MB")
-
-    return audio_file
+    print(f"  File size: {audio_size / (1024 * 1024):.2f} MB")
 
+    return audio_file, audio_size
 
-async def store_episode_in_database(script, audio_filename, article_ids):
-    """Store episode metadata in podcast_episodes table"""
-    print("💾 Storing episode in database...")
 
-    import httpx
+async def create_episode_row(article_ids):
+    """Pre-insert episode metadata into podcast_episodes (audio and script are filled in later)"""
+    print("💾 Creating episode row in database...")
 
-    # Create episode data
-    today = date.today().isoformat()
-    title = f"Daily Brief - {datetime.now().strftime('%B %d, %Y')}"
+    # Create episode data (UTC, matching the podcast service)
+    now = datetime.now(timezone.utc)
+    today = now.date().isoformat()
+    title = f"Daily Brief - {now:%B %d, %Y}"
     description = "Your daily AI-generated neutral news podcast covering the latest news"
-    audio_url = f"http://localhost:8000/audio/{audio_filename}"
-
-    # Estimate duration (rough estimate: 150 words per minute, ~4 chars per word)
-    duration_seconds = int((len(script) / 4) / 150 * 60)
 
     episode_data = {
         "title": title,
         "description": description,
         "publication_date": today,
-        "audio_url": audio_url,
-        "duration_seconds": duration_seconds,
-        "script": script,
         "article_ids": article_ids,
         "cover_image_url": "https://images.unsplash.com/photo-1478737270239-2f02b77fc618?w=800"
     }
 
     # Insert into database using REST API
-    headers = {
-        "apikey": INSFORGE_API_KEY,
-        "Authorization": f"Bearer {INSFORGE_API_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
+    response = await http_client.post(
+        "/rest/v1/podcast_episodes",
+        headers={"Prefer": "return=representation"},
+        json=episode_data
+    )
 
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{INSFORGE_BASE_URL}/rest/v1/podcast_episodes",
-            headers=headers,
-            json=episode_data
-        )
+    if response.status_code in [200, 201]:
+        result = response.json()
+        row = result[0] if isinstance(result, list) else result
+        print(f"✓ Episode row created")
+        print(f"  Episode ID: {row['id']}")
+        return row
+    else:
+        print(f"⚠️ Failed to create episode row: {response.status_code} - {response.text}")
+        return None
+
+
+async def finalize_episode_row(episode_id, audio_url, duration_seconds, script):
+    """Attach the generated audio and script to a previously created episode row"""
+    print("💾 Finalizing episode in database...")
+
+    response = await http_client.patch(
+        "/rest/v1/podcast_episodes",
+        # The caller already has every field; don't have the script echoed back
+        headers={"Prefer": "return=minimal", "Content-Type": "application/json"},
+        params={"id": f"eq.{episode_id}"},
+        content=orjson.dumps({"audio_url": audio_url, "duration_seconds": duration_seconds, "script": script})
+    )
 
-        if response.status_code in [200, 201]:
-            result = response.json()
-            print(f"✓ Episode stored in database")
-            print(f"  Episode ID: {result[0]['id'] if isinstance(result, list) else result['id']}")
-            return result
-        else:
-            print(f"⚠️ Failed to store episode: {response.status_code} - {response.text}")
-            return None
+    if response.status_code in [200, 204]:
+        print(f"✓ Episode stored in database")
+        return {"id": episode_id, "audio_url": audio_url, "duration_seconds": duration_seconds}
+    else:
+        print(f"⚠️ Failed to finalize episode: {response.status_code} - {response.text}")
+        return None
+
+
+async def delete_episode_row(episode_id):
+    """Remove a pre-inserted episode row whose audio never made it"""
+    response = await http_client.delete(
+        "/rest/v1/podcast_episodes",
+        headers={"Prefer": "return=minimal"},
+        params={"id": f"eq.{episode_id}"}
+    )
+
+    if response.status_code in [200, 204]:
+        print(f"✓ Removed unfinished episode row {episode_id}")
+    else:
+        print(f"⚠️ Failed to remove unfinished episode row {episode_id}: {response.status_code} - {response.text}")
 
 
 async def main():
@@ -224,35 +341,55 @@ async def main():
     print("🎙️ Neural Net Neutrality - Podcast Generator")
     print("=" * 60)
 
-    # Step 1: Fetch articles
-    articles = await fetch_articles()
-    article_ids = [a["id"] for a in articles]
-
-    # Step 2: Generate script
-    print("\n📝 Step 1: Generating script...")
-    script = await generate_script(articles)
-    print(f"\nScript Preview:\n{script[:200]}...\n")
-
-    # Step 3: Generate audio
-    print("🎙️ Step 2: Generating audio...")
-    audio_file = generate_audio(script)
-    audio_filename = audio_file.name
-
-    # Step 4: Store in database
-    print("\n💾 Step 3: Storing in database...")
-    episode = await store_episode_in_database(script, audio_filename, article_ids)
-
-    # Summary
-    print("\n" + "=" * 60)
-    print("✅ PODCAST EPISODE COMPLETE!")
-    print("=" * 60)
-    print(f"Script: {len(script)} characters")
-    print(f"Audio: {audio_file}")
-    print(f"Audio URL: http://localhost:8000/audio/{audio_filename}")
-    if episode:
-        print(f"Database: Stored successfully")
-    print(f"\n🎧 Play locally: open {audio_file}")
-    print(f"\n📱 View in app: http://localhost:8000/podcast-v2.html")
+    try:
+        # Step 1: Fetch articles
+        articles = await fetch_articles()
+        article_ids = [a["id"] for a in articles]
+
+        # In batch mode the script lands in the script cache, so the streaming
+        # step below replays it instead of calling the LLM again
+        if USE_BATCH_API:
+            await generate_script_batch(articles)
+
+        # Step 2 + 3: Stream the script into TTS sentence by sentence while the
+        # episode row is being created
+        print("\n📝 Step 1: Generating script and audio...")
+        script_parts = []
+        sentences = record_sentences(stream_script_sentences(openai_client, articles, SYSTEM_MESSAGE), script_parts)
+        row_task = asyncio.create_task(create_episode_row(article_ids))
+        episode = None
+        try:
+            audio_file, audio_size = await generate_audio(sentences)
+            script = "".join(script_parts).strip()
+            print(f"\nScript Preview:\n{script[:200]}...\n")
+            audio_filename = audio_file.name
+            audio_url = f"http://localhost:8000/audio/{audio_filename}"
+
+            # Step 4: Attach audio and script to the episode row
+            print("\n💾 Step 2: Storing in database...")
+            row = await row_task
+            if row:
+                duration_seconds = audio_duration_seconds(audio_size)
+                episode = await finalize_episode_row(row["id"], audio_url, duration_seconds, script)
+        finally:
+            # Never leave a pre-inserted row without audio behind
+            row = await row_task
+            if row and episode is None:
+                await delete_episode_row(row["id"])
+
+        # Summary
+        print("\n" + "=" * 60)
+        print("✅ PODCAST EPISODE COMPLETE!")
+        print("=" * 60)
+        print(f"Script: {len(script)} characters")
+        print(f"Audio: {audio_file}")
+        print(f"Audio URL: {audio_url}")
+        if episode:
+            print(f"Database: Stored successfully")
+        print(f"\n🎧 Play locally: open {audio_file}")
+        print(f"\n📱 View in app: http://localhost:8000/podcast-v2.html")
+    finally:
+        await http_client.aclose()
 
 
 if __name__ == "__main__":
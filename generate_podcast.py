@@ -11,18 +11,35 @@ POST /generate-podcast
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from contextlib import aclosing, asynccontextmanager
 from pathlib import Path
+from typing import AsyncIterator, Optional
+import asyncio
+import httpx
+import orjson
 import os
+import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import time
 from dotenv import load_dotenv
-from datetime import datetime
-import hashlib
+from datetime import date, datetime, timezone
 
 # Add news-report to path to import elevenlab module
 sys.path.append(str(Path(__file__).parent / "news-report"))
 
 from elevenlabs.client import ElevenLabs
 from elevenlabs import Voice, VoiceSettings
+# Use OpenAI SDK directly (InsForge AI only available via JavaScript SDK)
+from openai import AsyncOpenAI
+from podcast_pipeline import (
+    MODEL_ID, OUTPUT_FORMAT, TTS_LATENCY, VOICE_ID,
+    audio_duration_seconds, batch_sentences, record_sentences, stream_script_sentences, tts_cache_key
+)
+import script_cache
+from multipart_stream import multipart_file
 
 # Load environment variables
 load_dotenv(".env", override=True)
@@ -49,8 +66,96 @@ except ImportError:
 # Create ElevenLabs client
 elevenlabs_client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
 
+# Storage bucket holding TTS audio keyed by content hash
+TTS_CACHE_BUCKET = "tts-cache"
+
+# Blocking ElevenLabs streams hold a thread for the whole synthesis, so they get
+# their own pool instead of starving the default executor used by to_thread
+TTS_MAX_THREADS = int(os.getenv("TTS_MAX_THREADS", "32"))
+tts_executor = ThreadPoolExecutor(max_workers=TTS_MAX_THREADS, thread_name_prefix="tts")
+
+# Location header of an inserted row, e.g. /podcast_episodes?id=eq.<uuid>
+_LOCATION_ID_RE = re.compile(r"[?&]id=eq\.([^&]+)")
+
+# Date embedded in storage filenames (format: YYYY-MM-DD or YYYYMMDD)
+_DATE_RE = re.compile(r'(\d{4})-?(\d{2})-?(\d{2})')
+
+# Storage bucket and static metadata shared by every listed episode
+PODCAST_BUCKET = "podcast-episodes"
+EPISODE_DESCRIPTION = "Your daily AI-generated neutral news podcast covering the latest in AI and politics"
+EPISODE_COVER_URL = "https://images.unsplash.com/photo-1478737270239-2f02b77fc618?w=800"
+_AUDIO_URL_PREFIX = f"{INSFORGE_BASE_URL}/api/storage/buckets/{PODCAST_BUCKET}/objects/"
+
+# In-process cache of the storage bucket listing behind /podcasts
+PODCASTS_CACHE_TTL = 60
+_podcasts_cache = {"episodes": None, "etag": None, "expires_at": 0.0}
+# Today's episode row behind /podcasts/latest, keyed by date
+_latest_cache = {"date": None, "episode": None, "expires_at": 0.0}
+
+# Content hashes known to exist in the TTS cache bucket; once the listing
+# has loaded, keys missing from it are synthesized without a storage lookup
+_tts_cached_keys = set()
+_tts_index_loaded = asyncio.Event()
+
+# Audio chunks buffered per consumer (client, upload) by /generate-podcast/stream
+STREAM_QUEUE_SIZE = 16
+
+# Keeps references to fire-and-forget tasks so they are not garbage collected
+_background_tasks = set()
+
+
+async def preflight():
+    """Check OpenAI and ElevenLabs credentials concurrently at startup (warn only).
+
+    Also opens the first TLS connection to each API, so the first
+    /generate-podcast request does not pay for the handshakes.
+    """
+    checks = {"ElevenLabs voice": asyncio.to_thread(elevenlabs_client.voices.get, VOICE_ID)}
+    if app.state.openai is not None:
+        checks["OpenAI"] = app.state.openai.models.retrieve("gpt-5-mini")
+
+    results = await asyncio.gather(*checks.values(), return_exceptions=True)
+    for name, result in zip(checks, results):
+        if isinstance(result, Exception):
+            print(f"⚠️ {name} preflight failed: {result}")
+        else:
+            print(f"✓ {name} preflight ok")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share one pooled HTTP/2 client for all InsForge calls (and one OpenAI client)"""
+    app.state.http = httpx.AsyncClient(
+        base_url=INSFORGE_BASE_URL,
+        headers={
+            "apikey": INSFORGE_API_KEY,
+            "Authorization": f"Bearer {INSFORGE_API_KEY}"
+        },
+        http2=True,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+    )
+    # One OpenAI client (and connection pool) for the whole process
+    openai_key = os.getenv("OPENAI_API_KEY")
+    app.state.openai = AsyncOpenAI(
+        api_key=openai_key,
+        http_client=httpx.AsyncClient(http2=True, limits=httpx.Limits(max_keepalive_connections=8))
+    ) if openai_key else None
+
+    # Runs in the background so a slow API does not delay startup
+    for startup_job in (preflight(), load_tts_cache_index()):
+        task = asyncio.create_task(startup_job)
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+    yield
+    if app.state.openai is not None:
+        await app.state.openai.close()
+    await app.state.http.aclose()
+    tts_executor.shutdown(wait=False, cancel_futures=True)
+
+
 # FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS middleware
 app.add_middleware(
@@ -62,178 +167,361 @@ app.add_middleware(
 )
 
 
-def create_news_prompt(articles):
-    """Format articles into a news anchor script prompt"""
-    articles_text = ""
-    for i, article in enumerate(articles, 1):
-        source = article.get("news_sources", {}).get("name", "Unknown") if isinstance(article.get("news_sources"), dict) else "Unknown"
-        content = article.get("content") or article.get("summary") or "No content available"
-
-        articles_text += f"""
-            Story {i}: {article['title']}
-            Source: {source}
-            Content: {content}
-            ---
-            """
-
-    return f"""You are a professional news anchor creating a 2-3 minute broadcast script.
-
-        Create a politically neutral, natural and engaging news broadcast from these {len(articles)} top stories:
-
-        {articles_text}
-
-        Requirements:
-        - Start with a warm greeting and introduction (Your company: Neutral Network)
-        - This is a monologue, so never need to label who is saying what (i.e. no need to say Anchor: text, just say text)
-        - No settings or exposition (no need to say intro music, outro music, etc.)
-        - Present each story in a conversational, professional tone
-        - Use smooth transitions between stories
-        - Keep it concise but informative
-        - End with a brief closing statement
-
-        The complete script"""
-
 async def fetch_articles():
     """Fetch top 5 articles from InsForge database"""
     print("📰 Fetching top 5 articles from InsForge...")
 
     # Fetch directly from database via REST API
-    import httpx
-
-    headers = {
-        "apikey": INSFORGE_API_KEY,
-        "Authorization": f"Bearer {INSFORGE_API_KEY}"
-    }
+    response = await app.state.http.get(
+        "/rest/v1/news_articles",
+        params={
+            "select": "id,title,content,summary,url,published_at,news_sources(id,name)",
+            "order": "published_at.desc",
+            "limit": "5"
+        }
+    )
+    response.raise_for_status()
+    articles = orjson.loads(response.content)
 
-    async with httpx.AsyncClient() as http_client:
-        response = await http_client.get(
-            f"{INSFORGE_BASE_URL}/rest/v1/news_articles",
-            headers=headers,
-            params={
-                "select": "id,title,content,summary,url,published_at,news_sources(id,name)",
-                "order": "published_at.desc",
-                "limit": "5"
-            }
-        )
-        response.raise_for_status()
-        articles = response.json()
+    # Flatten the joined source name once; the prompt and the response both use it
+    for article in articles:
+        sources = article.get("news_sources")
+        article["source_name"] = sources.get("name", "Unknown") if isinstance(sources, dict) else "Unknown"
 
     print(f"✓ Found {len(articles)} articles")
     return articles
 
 
-async def generate_script(articles):
-    """Generate news script using OpenAI GPT-5-mini (cost-effective, high quality)"""
-    print("🤖 Generating news anchor script with OpenAI GPT-5-mini...")
-
-    prompt = create_news_prompt(articles)
-
-    # Use OpenAI SDK directly (InsForge AI only available via JavaScript SDK)
-    from openai import AsyncOpenAI
-
-    openai_key = os.getenv("OPENAI_API_KEY")
-    if not openai_key:
+def _openai_client():
+    if app.state.openai is None:
         raise ValueError("OPENAI_API_KEY not found in environment variables")
+    return app.state.openai
 
-    client = AsyncOpenAI(api_key=openai_key)
-
-    response = await client.chat.completions.create(
-        model="gpt-5-mini",  # Cost-effective alternative to gpt-5-mini
-        messages=[
-            {
-                "role": "system",
-                "content": "You are a professional news anchor with years of experience in broadcast journalism. Create engaging, clear, and professional news scripts."
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ],
-    )
-    script = response.choices[0].message.content
-    print("✓ Script generated successfully")
-    return script
 
+SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a professional news anchor with years of experience in broadcast journalism. Create engaging, clear, and professional news scripts."
+}
 
-def generate_audio_bytes(script: str) -> bytes:
-    """Generate audio from script using ElevenLabs TTS and return as bytes"""
-    print("🎙️ Generating audio with ElevenLabs...")
 
-    voice_id = "UgBBYS2sOqTuMpoF3BR0"  # Professional news anchor voice
-    model_id = "eleven_multilingual_v2"
+async def stream_tts(script: str) -> AsyncIterator[bytes]:
+    """Stream ElevenLabs TTS audio chunks as they are produced (no full-file buffer)"""
+    print("🎙️ Generating audio with ElevenLabs...")
 
-    # Generate audio using ElevenLabs SDK
-    audio_stream = elevenlabs_client.text_to_speech.convert(
-        text=script,
-        voice_id=voice_id,
-        model_id=model_id,
-        output_format="mp3_44100_128"
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=8)
+    cancelled = threading.Event()
+    done = object()
+
+    def produce():
+        # The ElevenLabs SDK yields chunks from a blocking generator, so it runs
+        # in a worker thread and hands chunks to the event loop through the queue
+        try:
+            audio_stream = elevenlabs_client.text_to_speech.stream(
+                text=script,
+                voice_id=VOICE_ID,
+                model_id=MODEL_ID,
+                output_format=OUTPUT_FORMAT,
+                optimize_streaming_latency=TTS_LATENCY
+            )
+            for chunk in audio_stream:
+                if cancelled.is_set():
+                    return
+                if chunk:
+                    asyncio.run_coroutine_threadsafe(queue.put(chunk), loop).result()
+        except Exception as e:
+            asyncio.run_coroutine_threadsafe(queue.put(e), loop).result()
+        finally:
+            if not cancelled.is_set():
+                asyncio.run_coroutine_threadsafe(queue.put(done), loop).result()
+
+    producer = loop.run_in_executor(tts_executor, produce)
+    total_bytes = 0
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            total_bytes += len(item)
+            yield item
+    finally:
+        cancelled.set()
+        # Unblock the producer if it is waiting on a full queue
+        while not queue.empty():
+            queue.get_nowait()
+        await producer
+
+    print(f"✓ Audio generated ({total_bytes} bytes)")
+
+
+async def load_tts_cache_index():
+    """Remember which TTS cache objects exist, so cached sentences can be synthesized on their own"""
+    response = await app.state.http.get(f"/api/storage/buckets/{TTS_CACHE_BUCKET}/objects")
+    if response.status_code != 200:
+        print(f"⚠️ TTS cache listing failed: {response.status_code} - {response.text}")
+        return
+    files = orjson.loads(response.content).get("data", [])
+    _tts_cached_keys.update(f.get("key", "").removesuffix(".mp3") for f in files)
+    _tts_index_loaded.set()
+    print(f"✓ {len(_tts_cached_keys)} cached TTS segments")
+
+
+async def _store_tts_cache(object_path: str, audio: bytes):
+    # If-None-Match: * keeps concurrent writers from overwriting each other
+    response = await app.state.http.post(
+        object_path,
+        headers={"If-None-Match": "*"},
+        files={"file": (object_path.rsplit("/", 1)[-1], audio, "audio/mpeg")},
+        timeout=120.0
     )
+    if response.status_code not in [200, 201, 412]:
+        print(f"⚠️ TTS cache store failed: {response.status_code} - {response.text}")
+        return
+    _tts_cached_keys.add(object_path.rsplit("/", 1)[-1].removesuffix(".mp3"))
+
+
+async def cached_tts(text: str) -> AsyncIterator[bytes]:
+    """TTS `text`, reusing audio already synthesized for the same text/voice/model/format"""
+    key = tts_cache_key(text)
+    object_path = f"/api/storage/buckets/{TTS_CACHE_BUCKET}/objects/{key}.mp3"
+
+    hit = False
+    # Once the bucket listing is loaded, a key missing from it is a known miss
+    if not _tts_index_loaded.is_set() or key in _tts_cached_keys:
+        try:
+            async with app.state.http.stream("GET", object_path) as response:
+                if response.status_code == 200:
+                    hit = True
+                    async for chunk in response.aiter_bytes():
+                        yield chunk
+        except httpx.HTTPError as e:
+            if hit:
+                raise
+            print(f"⚠️ TTS cache lookup failed: {e}")
+    if hit:
+        _tts_cached_keys.add(key)
+        print("✓ TTS cache hit")
+        return
+
+    chunks = []
+    async for chunk in stream_tts(text):
+        chunks.append(chunk)
+        yield chunk
+
+    task = asyncio.create_task(_store_tts_cache(object_path, b"".join(chunks)))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def synthesize_sentences(sentences: AsyncIterator[str], chunk_chars: int = 700) -> AsyncIterator[bytes]:
+    """TTS a stream of sentences as they arrive.
+
+    The first sentence is synthesized on its own so the first audio bytes
+    come back quickly; later sentences that have queued up meanwhile are
+    batched into requests of up to ~`chunk_chars` characters. Sentences
+    already in the TTS cache (recurring greetings, sign-offs) are never
+    merged into a batch, so their cached audio is reused.
+    """
+    def is_cached(text):
+        return tts_cache_key(text) in _tts_cached_keys
 
-    # Collect all chunks into bytes
-    audio_bytes = b""
-    for chunk in audio_stream:
-        audio_bytes += chunk
+    async with aclosing(batch_sentences(sentences, is_cached, chunk_chars, first_alone=True)) as batches:
+        async for text in batches:
+            async for chunk in cached_tts(text):
+                yield chunk
 
-    print(f"✓ Audio generated ({len(audio_bytes)} bytes)")
-    return audio_bytes
 
+async def upload_audio_to_insforge(audio: AsyncIterator[bytes], now: Optional[datetime] = None) -> tuple[str, int]:
+    """Stream audio chunks straight into InsForge Storage as they are produced.
 
-async def upload_audio_to_insforge(audio_bytes: bytes) -> str:
-    """Upload audio bytes directly to InsForge Storage and return public URL"""
+    Returns the public URL and the number of audio bytes uploaded.
+    """
     print("☁️ Uploading to InsForge Storage...")
 
-    # InsForge Storage bucket name
-    bucket_name = "podcast-episodes"
-
     # Generate unique filename
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    now = now or datetime.now(timezone.utc)
+    timestamp = now.strftime("%Y-%m-%d_%H-%M-%S")
     storage_filename = f"{timestamp}.mp3"
 
-    # Upload using httpx
-    import httpx
-    from io import BytesIO
+    audio_size = 0
+
+    async def counted():
+        nonlocal audio_size
+        async for chunk in audio:
+            audio_size += len(chunk)
+            yield chunk
+
+    # Storage expects a multipart "file" field; the form is streamed as a
+    # chunked body so each chunk goes out as soon as ElevenLabs produces it
+    content_type, body = multipart_file(counted(), storage_filename)
+    response = await app.state.http.post(
+        f"/api/storage/buckets/{PODCAST_BUCKET}/objects/{storage_filename}",
+        headers={"Content-Type": content_type},
+        content=body,
+        timeout=120.0
+    )
 
-    headers = {
-        "apikey": INSFORGE_API_KEY,
-        "Authorization": f"Bearer {INSFORGE_API_KEY}",
-    }
+    if response.status_code not in [200, 201]:
+        print(f"Upload failed: {response.status_code} - {response.text}")
+        raise HTTPException(status_code=500, detail=f"Failed to upload to storage: {response.text}")
 
-    # Create file-like object from bytes
-    audio_file = BytesIO(audio_bytes)
-    files = {"file": (storage_filename, audio_file, "audio/mpeg")}
+    # New object in the bucket: make the next /podcasts call revalidate
+    _podcasts_cache["expires_at"] = 0.0
 
-    async with httpx.AsyncClient(timeout=120.0) as http_client:
-        response = await http_client.post(
-            f"{INSFORGE_BASE_URL}/api/storage/buckets/{bucket_name}/objects/{storage_filename}",
-            headers=headers,
-            files=files
+    # Get public URL
+    public_url = f"{_AUDIO_URL_PREFIX}{storage_filename}"
+
+    print(f"✓ Uploaded to {public_url}")
+    return public_url, audio_size
+
+
+def format_articles(articles: list) -> list:
+    """Shape articles for the /generate-podcast response"""
+    return [
+        {
+            "id": a.get("id"),
+            "title": a.get("title"),
+            "source": a["source_name"],
+            "published_at": a.get("published_at"),
+            "url": a.get("url")
+        }
+        for a in articles
+    ]
+
+
+@app.post("/generate-podcast/stream")
+async def generate_podcast_stream():
+    """
+    Generate a podcast episode and stream the MP3 back while it is produced.
+
+    Script tokens from GPT-5-mini are split into sentences and fed to
+    ElevenLabs as they complete; the resulting audio is sent to the client
+    and uploaded to InsForge Storage at the same time. The final storage URL
+    is returned up front in the X-Audio-Url header.
+    """
+    # Everything that can fail up front does so before the 200 goes out
+    try:
+        openai_client = _openai_client()
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    articles = await fetch_articles()
+
+    if not articles or len(articles) == 0:
+        raise HTTPException(
+            status_code=404,
+            detail="No articles found. Please run the scraper first."
         )
 
+    now = datetime.now(timezone.utc)
+    storage_filename = f"{now:%Y-%m-%d_%H-%M-%S}.mp3"
+    audio_url = f"{_AUDIO_URL_PREFIX}{storage_filename}"
+
+    script_parts = []
+    # Bounded, so a slow client or slow storage holds TTS back instead of
+    # buffering the episode in memory
+    client_queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+    upload_queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+    client_gone = asyncio.Event()
+    upload_gone = asyncio.Event()
+    pipeline_error = None
+
+    def abandon(queue, gone):
+        # The consumer stopped: unblock a pending put and skip later ones
+        gone.set()
+        while not queue.empty():
+            queue.get_nowait()
+
+    async def feed(queue, gone, item):
+        if not gone.is_set():
+            await queue.put(item)
+
+    async def upload_body():
+        while (chunk := await upload_queue.get()) is not None:
+            yield chunk
+
+    async def pipeline():
+        nonlocal pipeline_error
+        # Runs independently of the client connection so the episode is
+        # still uploaded and saved if the listener disconnects early
+        content_type, body = multipart_file(upload_body(), storage_filename)
+        upload_task = asyncio.create_task(app.state.http.post(
+            f"/api/storage/buckets/{PODCAST_BUCKET}/objects/{storage_filename}",
+            headers={"Content-Type": content_type},
+            content=body,
+            timeout=120.0
+        ))
+        upload_task.add_done_callback(lambda _: abandon(upload_queue, upload_gone))
+        audio_size = 0
+        try:
+            sentences = record_sentences(stream_script_sentences(openai_client, articles, SYSTEM_MESSAGE), script_parts)
+            async for chunk in synthesize_sentences(sentences):
+                audio_size += len(chunk)
+                await feed(upload_queue, upload_gone, chunk)
+                await feed(client_queue, client_gone, chunk)
+        except Exception as e:
+            print(f"❌ Error streaming podcast: {e}")
+            # Set before the end-of-stream marker below, so client_body sees it
+            pipeline_error = e
+            upload_task.cancel()
+            return
+        finally:
+            await feed(upload_queue, upload_gone, None)
+            await feed(client_queue, client_gone, None)
+
+        response = await upload_task
         if response.status_code not in [200, 201]:
             print(f"Upload failed: {response.status_code} - {response.text}")
-            raise HTTPException(status_code=500, detail=f"Failed to upload to storage: {response.text}")
+            return
+        _podcasts_cache["expires_at"] = 0.0
+        print(f"✓ Uploaded to {audio_url}")
 
-    # Get public URL
-    public_url = f"{INSFORGE_BASE_URL}/api/storage/buckets/{bucket_name}/objects/{storage_filename}"
+        await save_episode_to_database(
+            audio_url=audio_url,
+            script="".join(script_parts).strip(),
+            articles=articles,
+            duration=audio_duration_seconds(audio_size),
+            now=now
+        )
+        print("✅ Podcast streamed successfully!")
 
-    print(f"✓ Uploaded to {public_url}")
-    return public_url
+    task = asyncio.create_task(pipeline())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+    async def client_body():
+        try:
+            while (chunk := await client_queue.get()) is not None:
+                yield chunk
+            if pipeline_error is not None:
+                # Headers are already sent: abort the response so the client
+                # sees a truncated stream rather than a complete MP3
+                raise RuntimeError("Podcast generation failed") from pipeline_error
+        finally:
+            abandon(client_queue, client_gone)
+
+    return StreamingResponse(client_body(), media_type="audio/mpeg", headers={"X-Audio-Url": audio_url})
 
 
 @app.post("/generate-podcast")
-async def generate_podcast():
+async def generate_podcast(force: bool = False):
     """
     Generate a complete podcast episode:
-    1. Fetch articles
-    2. Generate script
-    3. Convert to audio
-    4. Upload to storage
+    1. Fetch articles (and look up today's episode at the same time)
+    2. Stream the script sentence by sentence
+    3. Convert each sentence to audio and stream it into storage
+    4. Save episode to database
     5. Return metadata
+
+    If today's episode already exists it is returned as-is unless `force` is set.
     """
+    # One clock reading per request: filename, publication date and response agree
+    now = datetime.now(timezone.utc)
     try:
-        # Step 1: Fetch articles
-        articles = await fetch_articles()
+        # Step 1: Fetch articles while checking for an episode generated earlier today
+        articles, existing = await asyncio.gather(fetch_articles(), fetch_today_episode(now.date(), use_cache=False))
 
         if not articles or len(articles) == 0:
             raise HTTPException(
@@ -241,37 +529,43 @@ async def generate_podcast():
                 detail="No articles found. Please run the scraper first."
             )
 
-        # Step 2: Generate script
-        script = await generate_script(articles)
-
-        # Step 3: Generate audio (directly to bytes, no local file)
-        audio_bytes = generate_audio_bytes(script)
+        if existing and existing.get("audio_url") and not force:
+            print("✓ Today's episode already exists, skipping generation")
+            episode_article_ids = set(existing.get("article_ids") or [])
+            episode_articles = [a for a in articles if a.get("id") in episode_article_ids]
+            return {
+                "success": True,
+                "audioUrl": existing["audio_url"],
+                "script": existing.get("script"),
+                "duration": existing.get("duration_seconds"),
+                "articles": format_articles(episode_articles),
+                "metadata": {
+                    "generated_at": existing.get("created_at"),
+                    "model": "gpt-5-mini",
+                    "voice": "ElevenLabs - Professional Anchor",
+                    "articles_count": len(episode_article_ids)
+                },
+                "episode_id": existing.get("id"),
+                "cached": True
+            }
 
-        # Step 4: Upload to InsForge Storage (stream directly from memory)
-        audio_url = await upload_audio_to_insforge(audio_bytes)
+        # Step 2-4: Stream the script, synthesize each sentence as it completes and
+        # upload the audio as it arrives
+        script_parts = []
+        sentences = record_sentences(stream_script_sentences(_openai_client(), articles, SYSTEM_MESSAGE), script_parts)
+        audio_url, audio_size = await upload_audio_to_insforge(synthesize_sentences(sentences), now)
+        script = "".join(script_parts).strip()
 
-        # Step 5: Get audio duration (rough estimate from size)
-        # More accurate duration would require audio analysis library
-        audio_size_mb = len(audio_bytes) / (1024 * 1024)
-        estimated_duration_seconds = int(audio_size_mb * 60)  # Rough estimate: 1MB ≈ 1 minute
+        # Step 5: Get audio duration from the bytes streamed (exact for CBR MP3 and PCM)
+        duration_seconds = audio_duration_seconds(audio_size)
 
         # Step 6: Save to database
-        articles_formatted = [
-            {
-                "id": a.get("id"),
-                "title": a.get("title"),
-                "source": a.get("news_sources", {}).get("name", "Unknown") if isinstance(a.get("news_sources"), dict) else "Unknown",
-                "published_at": a.get("published_at"),
-                "url": a.get("url")
-            }
-            for a in articles
-        ]
-
         episode_db_entry = await save_episode_to_database(
             audio_url=audio_url,
             script=script,
             articles=articles,
-            duration=estimated_duration_seconds
+            duration=duration_seconds,
+            now=now
         )
 
         # Step 7: Format response
@@ -279,10 +573,10 @@ async def generate_podcast():
             "success": True,
             "audioUrl": audio_url,
             "script": script,
-            "duration": estimated_duration_seconds,
-            "articles": articles_formatted,
+            "duration": duration_seconds,
+            "articles": format_articles(articles),
             "metadata": {
-                "generated_at": datetime.now().isoformat(),
+                "generated_at": now.isoformat(),
                 "model": "gpt-5-mini",
                 "voice": "ElevenLabs - Professional Anchor",
                 "articles_count": len(articles)
@@ -303,21 +597,17 @@ async def generate_podcast():
         )
 
 
-async def save_episode_to_database(audio_url: str, script: str, articles: list, duration: int) -> dict:
+async def save_episode_to_database(audio_url: str, script: str, articles: list, duration: int, now: Optional[datetime] = None) -> dict:
     """Save episode metadata to InsForge podcast_episodes table"""
     print("💾 Saving episode to database...")
 
-    import httpx
-
-    today = datetime.now().date().isoformat()
-    title = f"Daily Brief - {datetime.now().strftime('%B %d, %Y')}"
+    now = now or datetime.now(timezone.utc)
+    today = now.date().isoformat()
+    title = f"Daily Brief - {now:%B %d, %Y}"
 
-    headers = {
-        "apikey": INSFORGE_API_KEY,
-        "Authorization": f"Bearer {INSFORGE_API_KEY}",
-        "Content-Type": "application/json",
-        "Prefer": "return=representation"
-    }
+    # Only the new row's id is needed, and PostgREST puts it in the Location
+    # header; asking for the representation would echo the whole script back
+    headers = {"Prefer": "return=headers-only", "Content-Type": "application/json"}
 
     # Extract article IDs
     article_ids = [a.get("id") for a in articles if a.get("id")]
@@ -332,145 +622,171 @@ async def save_episode_to_database(audio_url: str, script: str, articles: list,
         "article_ids": article_ids
     }
 
-    async with httpx.AsyncClient(timeout=30.0) as http_client:
-        response = await http_client.post(
-            f"{INSFORGE_BASE_URL}/rest/v1/podcast_episodes",
-            headers=headers,
-            json=payload
-        )
+    response = await app.state.http.post(
+        "/rest/v1/podcast_episodes",
+        headers=headers,
+        content=orjson.dumps(payload)
+    )
 
-        if response.status_code not in [200, 201]:
-            print(f"Database save failed: {response.status_code} - {response.text}")
-            # Don't fail the whole request if DB save fails
-            return None
+    if response.status_code not in [200, 201]:
+        print(f"Database save failed: {response.status_code} - {response.text}")
+        # Don't fail the whole request if DB save fails
+        return None
 
-        episode_data = response.json()
+    match = _LOCATION_ID_RE.search(response.headers.get("Location", ""))
+
+    # Today's episode changed: make the next /podcasts/latest lookup hit the database
+    _latest_cache["expires_at"] = 0.0
 
     print(f"✓ Episode saved to database")
-    return episode_data[0] if isinstance(episode_data, list) else episode_data
+    return {**payload, "id": match.group(1) if match else None}
 
 
-@app.get("/podcasts")
-async def get_podcasts(limit: int = 10):
-    """Get list of podcast episodes from InsForge storage bucket"""
-    import httpx
-    import re
-    from datetime import datetime
+async def _fetch_storage_episodes():
+    """List the storage bucket as (publication_date, file) pairs (newest first), served from a short TTL cache.
+
+    After the TTL expires the listing is revalidated with If-None-Match, so an
+    unchanged bucket costs a 304 instead of a full listing + re-parse.
+    Returns None if storage could not be listed.
+    """
+    now = time.monotonic()
+    cached = _podcasts_cache["episodes"]
+
+    if cached is not None and now < _podcasts_cache["expires_at"]:
+        return cached
+
+    headers = {}
+    if cached is not None and _podcasts_cache["etag"]:
+        headers["If-None-Match"] = _podcasts_cache["etag"]
+
+    # List all files in the bucket
+    response = await app.state.http.get(f"/api/storage/buckets/{PODCAST_BUCKET}/objects", headers=headers)
+
+    if response.status_code == 304:
+        _podcasts_cache["expires_at"] = now + PODCASTS_CACHE_TTL
+        return cached
+
+    if response.status_code != 200:
+        print(f"Storage fetch failed: {response.status_code} - {response.text}")
+        return None
+
+    result = orjson.loads(response.content)
+    files = result.get("data", [])
+    print(f"✓ Found {len(files)} files in storage")
+
+    # Keep (publication_date, file) pairs only; response dicts are built
+    # later for the episodes that survive the limit
+    entries = []
+    for file in files:
+        file_name = file.get("key", "")
+
+        # Skip non-mp3 files
+        if not file_name.endswith(".mp3"):
+            continue
+
+        # Parse date from filename (format: YYYY-MM-DD or YYYYMMDD)
+        date_match = _DATE_RE.search(file_name)
+        if date_match:
+            publication_date = "-".join(date_match.groups())
+        else:
+            # Fallback to file upload date (ISO timestamp), then today
+            uploaded_at = file.get("uploaded_at", "") or file.get("uploadedAt", "")
+            publication_date = uploaded_at[:10] if uploaded_at else datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+        entries.append((publication_date, file))
+
+    # Sort by date (newest first)
+    entries.sort(key=lambda entry: entry[0], reverse=True)
+
+    _podcasts_cache.update(
+        episodes=entries,
+        etag=response.headers.get("etag"),
+        expires_at=now + PODCASTS_CACHE_TTL
+    )
+    return entries
 
-    print("📡 Fetching podcast episodes from InsForge storage...")
 
-    # Fetch files from storage bucket
-    headers = {
-        "apikey": INSFORGE_API_KEY,
-        "Authorization": f"Bearer {INSFORGE_API_KEY}"
+def _episode_from_file(publication_date, file):
+    """Build the /podcasts episode dict for one storage object"""
+    file_name = file.get("key", "")
+
+    # Get duration from file size (episodes are CBR 128 kbps MP3)
+    file_size = file.get("size", 0)
+
+    return {
+        "id": file.get("id", file_name),  # Use file ID or name as episode ID
+        "title": f"Daily Brief - {date.fromisoformat(publication_date):%B %d, %Y}",
+        "description": EPISODE_DESCRIPTION,
+        "publication_date": publication_date,
+        # Use the URL from response or construct it
+        "audio_url": file.get("url") or _AUDIO_URL_PREFIX + file_name,
+        "duration_seconds": audio_duration_seconds(file_size) if file_size else 0,
+        "cover_image_url": EPISODE_COVER_URL,
+        "play_count": 0
     }
 
-    bucket_name = "podcast-episodes"
+
+@app.get("/podcasts")
+async def get_podcasts(response: Response, limit: int = 10):
+    """Get list of podcast episodes from InsForge storage bucket"""
+    print("📡 Fetching podcast episodes from InsForge storage...")
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as http_client:
-            # List all files in the bucket
-            response = await http_client.get(
-                f"{INSFORGE_BASE_URL}/api/storage/buckets/{bucket_name}/objects",
-                headers=headers
-            )
+        entries = await _fetch_storage_episodes()
+        if entries is None:
+            return {"episodes": [], "count": 0}
+
+        # Apply limit, then build response dicts only for what is returned
+        episodes = [_episode_from_file(publication_date, file) for publication_date, file in entries[:limit]]
 
-            if response.status_code != 200:
-                print(f"Storage fetch failed: {response.status_code} - {response.text}")
-                return {"episodes": [], "count": 0}
-
-            result = response.json()
-            files = result.get("data", [])
-            print(f"✓ Found {len(files)} files in storage")
-
-            # Convert storage files to episode format
-            episodes = []
-            for file in files:
-                file_name = file.get("key", "")
-
-                # Skip non-mp3 files
-                if not file_name.endswith(".mp3"):
-                    continue
-
-                # Parse date from filename (format: YYYY-MM-DD or YYYYMMDD)
-                date_match = re.search(r'(\d{4})-?(\d{2})-?(\d{2})', file_name)
-                if date_match:
-                    year, month, day = date_match.groups()
-                    publication_date = f"{year}-{month}-{day}"
-                    formatted_date = datetime.strptime(publication_date, "%Y-%m-%d")
-                else:
-                    # Fallback to file upload date
-                    uploaded_at = file.get("uploaded_at", "") or file.get("uploadedAt", "")
-                    if uploaded_at:
-                        formatted_date = datetime.fromisoformat(uploaded_at.replace('Z', '+00:00'))
-                        publication_date = formatted_date.strftime("%Y-%m-%d")
-                    else:
-                        publication_date = datetime.now().strftime("%Y-%m-%d")
-                        formatted_date = datetime.now()
-
-                # Generate episode metadata
-                episode_title = f"Daily Brief - {formatted_date.strftime('%B %d, %Y')}"
-
-                # Use the URL from response or construct it
-                audio_url = file.get("url") or f"{INSFORGE_BASE_URL}/api/storage/buckets/{bucket_name}/objects/{file_name}"
-
-                # Get duration from file size (rough: 1MB ≈ 1 minute at 128kbps)
-                file_size = file.get("size", 0)
-                estimated_duration = int(file_size / (1024 * 1024) * 60) if file_size else 0
-
-                episode = {
-                    "id": file.get("id", file_name),  # Use file ID or name as episode ID
-                    "title": episode_title,
-                    "description": "Your daily AI-generated neutral news podcast covering the latest in AI and politics",
-                    "publication_date": publication_date,
-                    "audio_url": audio_url,
-                    "duration_seconds": estimated_duration,
-                    "cover_image_url": "https://images.unsplash.com/photo-1478737270239-2f02b77fc618?w=800",
-                    "play_count": 0
-                }
-                episodes.append(episode)
-
-            # Sort by date (newest first)
-            episodes.sort(key=lambda x: x["publication_date"], reverse=True)
-
-            # Apply limit
-            episodes = episodes[:limit]
-
-            print(f"✓ Returning {len(episodes)} episodes")
-            return {"episodes": episodes, "count": len(episodes)}
+        response.headers["Cache-Control"] = f"public, max-age={PODCASTS_CACHE_TTL}"
+        print(f"✓ Returning {len(episodes)} episodes")
+        return {"episodes": episodes, "count": len(episodes)}
 
     except Exception as e:
         print(f"❌ Error fetching episodes: {e}")
         return {"episodes": [], "count": 0}
 
 
-@app.get("/podcasts/latest")
-async def get_latest_podcast():
-    """Get today's podcast episode"""
-    import httpx
+async def fetch_today_episode(day: Optional[date] = None, use_cache: bool = True):
+    """Today's (UTC) podcast_episodes row, or None (served from a short TTL cache).
 
-    today = datetime.now().date().isoformat()
+    The cache is per worker process and only invalidated by the worker that
+    saved, so callers deciding whether to generate pass `use_cache=False`.
+    """
+    today = (day or datetime.now(timezone.utc).date()).isoformat()
+    now = time.monotonic()
+    if use_cache and _latest_cache["date"] == today and now < _latest_cache["expires_at"]:
+        return _latest_cache["episode"]
+
+    response = await app.state.http.get(
+        "/rest/v1/podcast_episodes",
+        params={
+            "publication_date": f"eq.{today}",
+            # Rows pre-inserted by a run still in progress have no audio yet
+            "audio_url": "not.is.null",
+            "select": "*",
+            "order": "created_at.desc",
+            "limit": 1
+        }
+    )
 
-    headers = {
-        "apikey": INSFORGE_API_KEY,
-        "Authorization": f"Bearer {INSFORGE_API_KEY}"
-    }
+    if response.status_code != 200:
+        return None
+
+    episodes = orjson.loads(response.content)
+    episode = episodes[0] if episodes else None
+    _latest_cache.update(date=today, episode=episode, expires_at=now + PODCASTS_CACHE_TTL)
+    return episode
 
-    async with httpx.AsyncClient() as http_client:
-        response = await http_client.get(
-            f"{INSFORGE_BASE_URL}/rest/v1/podcast_episodes",
-            headers=headers,
-            params={
-                "publication_date": f"eq.{today}",
-                "select": "*",
-                "limit": 1
-            }
-        )
 
-        if response.status_code == 200:
-            episodes = response.json()
-            if episodes and len(episodes) > 0:
-                return {"episode": episodes[0], "found": True}
+@app.get("/podcasts/latest")
+async def get_latest_podcast(response: Response):
+    """Get today's podcast episode"""
+    episode = await fetch_today_episode()
+    response.headers["Cache-Control"] = f"public, max-age={PODCASTS_CACHE_TTL}"
+    if episode:
+        return {"episode": episode, "found": True}
 
     return {"episode": None, "found": False, "message": "No episode for today yet"}
 
@@ -481,10 +797,24 @@ async def health_check():
     return {
         "status": "healthy",
         "service": "podcast-generator",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "script_cache": script_cache.stats
     }
 
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8081, reload=True)
+    # "auto" picks uvloop + httptools when installed (requirements skip uvloop
+    # on Windows); RELOAD=1 restores the dev server. One process by default:
+    # the preflight, episode and TTS caches live in process memory and the
+    # script cache is a single sqlite file, so extra workers
+    # (WEB_CONCURRENCY) each warm their own caches and contend on that file
+    uvicorn.run(
+        "generate_podcast:app",
+        host="0.0.0.0",
+        port=8081,
+        loop="auto",
+        http="auto",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        reload=os.getenv("RELOAD") == "1"
+    )
@@ -0,0 +1,32 @@
+"""
+Streaming multipart/form-data bodies for InsForge Storage uploads.
+
+The storage API takes the object as the `file` field of a multipart form.
+httpx only builds multipart bodies from complete files, so audio that is
+still being synthesized is wrapped here instead: the part headers go out
+first, then each chunk as it arrives, then the closing boundary.
+"""
+
+import secrets
+
+
+def multipart_file(chunks, filename, content_type="audio/mpeg", field="file"):
+    """Wrap the async iterator `chunks` as one multipart file field.
+
+    Returns (content_type_header, body) for an httpx request with
+    `content=body`, sent as a chunked request.
+    """
+    boundary = secrets.token_hex(16)
+    preamble = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode()
+
+    async def body():
+        yield preamble
+        async for chunk in chunks:
+            yield chunk
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    return f"multipart/form-data; boundary={boundary}", body()
@@ -1,3 +1,4 @@
+import asyncio
 from elevenlabs.client import ElevenLabs
 from elevenlabs.play import play
 import os
@@ -18,15 +19,22 @@ def synthesize_elevenlab(
   voice_id: str = "UgBBYS2sOqTuMpoF3BR0",
   model_id: str = "eleven_multilingual_v2",
   output_format: str = "mp3_44100_128",
+  latency: int = 3,
   play_audio: bool = False,
 ) -> Path:
   """Synthesize `text` using ElevenLabs, save to `output_path`, and return the Path.
 
-  - If `output_path` is None the file is saved to `backend/voice/audio-data/latest-news.mp3`.
-  - `play_audio=True` will play the generated audio after saving.
+  - If `output_path` is None the file is saved to `backend/voice/audio-data/latest-news.mp3`
+    (`latest-news.pcm` for raw `pcm_*` formats).
+  - `latency` is ElevenLabs' `optimize_streaming_latency` level (0-4).
+  - `output_format="pcm_24000"` skips server-side MP3 encoding for the lowest
+    time-to-first-byte; the file is raw 16-bit mono PCM at that sample rate
+    (e.g. `ffmpeg -f s16le -ar 24000 -ac 1 -i latest-news.pcm out.mp3`).
+  - `play_audio=True` will play the generated audio after saving (encoded formats only).
   """
+  is_pcm = output_format.startswith("pcm_")
   if output_path is None:
-    output_path = Path(__file__).parent / "audio-data" / "latest-news.mp3"
+    output_path = Path(__file__).parent / "audio-data" / ("latest-news.pcm" if is_pcm else "latest-news.mp3")
   else:
     output_path = Path(output_path)
 
@@ -34,19 +42,20 @@ def synthesize_elevenlab(
   output_path.parent.mkdir(parents=True, exist_ok=True)
 
   # Get streaming audio bytes from SDK
-  audio_stream = elevenlabs.text_to_speech.convert(
+  audio_stream = elevenlabs.text_to_speech.stream(
     text=text,
     voice_id=voice_id,
     model_id=model_id,
     output_format=output_format,
+    optimize_streaming_latency=latency,
   )
 
-  # Write stream to file (streaming iterable of bytes/chunks)
-  with output_path.open("wb") as f:
-    for chunk in audio_stream:
-      f.write(chunk)
+  # Write stream to file (streaming iterable of bytes/chunks); the 64 KiB
+  # buffer turns many small chunk writes into a few syscalls
+  with output_path.open("wb", buffering=1 << 16) as f:
+    f.writelines(chunk for chunk in audio_stream if chunk)
 
-  if play_audio:
+  if play_audio and not is_pcm:
     # Play the saved file by reading its bytes (SDK play accepts bytes)
     with output_path.open("rb") as f:
       play(f.read())
@@ -54,6 +63,15 @@ def synthesize_elevenlab(
   return output_path
 
 
+async def synthesize_elevenlab_async(*args, **kwargs) -> Path:
+  """Async variant of `synthesize_elevenlab` for use inside an event loop (e.g. FastAPI handlers).
+
+  The SDK call and the chunk-write loop are blocking, so they run in a worker
+  thread and the loop keeps serving other requests meanwhile.
+  """
+  return await asyncio.to_thread(synthesize_elevenlab, *args, **kwargs)
+
+
 if __name__ == "__main__":
   # Quick local demo when running the module directly
   demo_text = "The first move is what sets everything in motion."
@@ -1,3 +1,4 @@
+import asyncio
 from fish_audio_sdk import Session, TTSRequest
 from dotenv import load_dotenv
 import os
@@ -33,13 +34,22 @@ def synthesize_fish(
 
   output_path.parent.mkdir(parents=True, exist_ok=True)
 
-  with output_path.open("wb") as f:
-    for chunk in session.tts(TTSRequest(text=script), backend=backend):
-      f.write(chunk)
+  # 64 KiB buffer: many small chunk writes become a few syscalls
+  with output_path.open("wb", buffering=1 << 16) as f:
+    f.writelines(session.tts(TTSRequest(text=script), backend=backend))
 
   return output_path
 
 
+async def synthesize_fish_async(*args, **kwargs) -> Path:
+  """Async variant of `synthesize_fish` for use inside an event loop (e.g. FastAPI handlers).
+
+  The SDK call and the chunk-write loop are blocking, so they run in a worker
+  thread and the loop keeps serving other requests meanwhile.
+  """
+  return await asyncio.to_thread(synthesize_fish, *args, **kwargs)
+
+
 if __name__ == "__main__":
   demo_script = "Hello — this is a quick test of the Fish TTS synthesize_fish function."
   out = synthesize_fish(demo_script, output_path=Path(__file__).parent / "audio-data" / "fish-demo.mp3")
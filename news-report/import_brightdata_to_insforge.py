@@ -5,16 +5,42 @@ Usage: python import_brightdata_to_insforge.py <json_file_path> <source_name>
 Example: python import_brightdata_to_insforge.py data/bbc_news.json BBC
 """
 
+import asyncio
+import hashlib
 import json
 import sys
 import os
 from datetime import datetime
-import requests
+from itertools import islice
+import httpx
+
+# ijson parses the Bright Data array incrementally, keeping memory flat for
+# large dumps; without it the whole file is loaded with json.load
+try:
+    import ijson
+    JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:
+    ijson = None
+    JSON_ERRORS = (json.JSONDecodeError,)
 
 # InsForge configuration
 INSFORGE_BASE_URL = "https://sv7kpi43.us-east.insforge.app"
 INSFORGE_API_KEY = os.environ.get("INSFORGE_API_KEY", "ik_194453edb70ffcd51d76e2718b3f9eed")
 
+# One pooled HTTP/2 client for every InsForge call, so the insert batches and
+# the source timestamp update share TCP/TLS connections
+http_client = httpx.AsyncClient(
+    base_url=INSFORGE_BASE_URL,
+    headers={
+        "Content-Type": "application/json",
+        "apikey": INSFORGE_API_KEY,
+        "Authorization": f"Bearer {INSFORGE_API_KEY}"
+    },
+    http2=True,
+    timeout=60.0,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=32)
+)
+
 # News source ID mapping (from your InsForge database)
 SOURCE_IDS = {
     "BBC": "969e05ab-1549-4c61-a7ad-accff1f0eb5f",
@@ -55,9 +81,10 @@ def parse_brightdata_article(article, source_id):
 
     # Generate a pseudo-URL if not available (for uniqueness constraint)
     if not url or url == "https://www.bbc.com/":
-        # Use headline hash for unique URL
-        import hashlib
-        headline_hash = hashlib.md5(article["headline"].encode()).hexdigest()[:12]
+        # Use headline hash for unique URL. The hash is part of the stored URL
+        # (the on_conflict key), so it must stay MD5 for re-imports to dedupe;
+        # usedforsecurity=False keeps it working on FIPS-restricted builds
+        headline_hash = hashlib.md5(article["headline"].encode(), usedforsecurity=False).hexdigest()[:12]
         base_domain = "https://www.bbc.com/news/articles/"
         url = f"{base_domain}{headline_hash}"
 
@@ -74,64 +101,81 @@ def parse_brightdata_article(article, source_id):
     }
 
 
-def insert_articles_to_insforge(articles):
+# Rows per bulk POST, and concurrent single-row POSTs when a batch has to be retried row by row
+INSERT_BATCH_SIZE = 500
+INSERT_CONCURRENCY = 16
+
+
+async def _insert_rows_individually(url, headers, rows, errors):
+    """Retry a rejected batch one row at a time (concurrently) to isolate the bad rows"""
+    semaphore = asyncio.Semaphore(INSERT_CONCURRENCY)
+
+    async def insert_one(article):
+        async with semaphore:
+            try:
+                response = await http_client.post(url, headers=headers, json=[article], params={"on_conflict": "url"})
+            except Exception as e:
+                errors.append(f"Exception for '{article['title'][:40]}': {str(e)}")
+                print(f"✗ Exception: {article['title'][:60]}... - {str(e)}")
+                return 0
+        if response.status_code in [200, 201]:
+            return len(response.json())
+        errors.append(f"Error inserting '{article['title'][:40]}': {response.status_code} - {response.text}")
+        print(f"✗ Error: {response.status_code} - {article['title'][:60]}...")
+        return 0
+
+    return sum(await asyncio.gather(*(insert_one(article) for article in rows)))
+
+
+async def insert_articles_to_insforge(articles):
     """
     Bulk insert articles into InsForge database
     Uses the InsForge REST API
     """
 
     headers = {
-        "Content-Type": "application/json",
-        "apikey": INSFORGE_API_KEY,
-        "Authorization": f"Bearer {INSFORGE_API_KEY}"
+        # Existing URLs are skipped; only newly inserted rows come back
+        "Prefer": "resolution=ignore-duplicates,return=representation"
     }
 
-    # InsForge uses PostgREST, so we can insert multiple records
-    url = f"{INSFORGE_BASE_URL}/rest/v1/news_articles"
+    # InsForge uses PostgREST, so each batch is one POST of a JSON array
+    url = "/rest/v1/news_articles"
 
     inserted = 0
-    skipped = 0
     errors = []
 
-    for article in articles:
+    for i in range(0, len(articles), INSERT_BATCH_SIZE):
+        batch = articles[i:i + INSERT_BATCH_SIZE]
         try:
-            response = requests.post(
-                url,
-                headers=headers,
-                json=article,
-                params={"on_conflict": "url"}  # Skip duplicates
-            )
-
-            if response.status_code in [200, 201]:
-                inserted += 1
-                print(f"✓ Inserted: {article['title'][:60]}...")
-            elif response.status_code == 409:
-                skipped += 1
-                print(f"⊘ Skipped (duplicate): {article['title'][:60]}...")
-            else:
-                errors.append(f"Error inserting '{article['title'][:40]}': {response.status_code} - {response.text}")
-                print(f"✗ Error: {response.status_code} - {article['title'][:60]}...")
+            response = await http_client.post(url, headers=headers, json=batch, params={"on_conflict": "url"})
         except Exception as e:
-            errors.append(f"Exception for '{article['title'][:40]}': {str(e)}")
-            print(f"✗ Exception: {article['title'][:60]}... - {str(e)}")
+            print(f"✗ Batch exception ({len(batch)} articles): {str(e)}, retrying row by row")
+            inserted += await _insert_rows_individually(url, headers, batch, errors)
+            continue
+
+        if response.status_code in [200, 201]:
+            batch_inserted = len(response.json())
+            inserted += batch_inserted
+            print(f"✓ Inserted {batch_inserted} of {len(batch)} articles")
+        else:
+            print(f"✗ Batch error: {response.status_code}, retrying row by row")
+            inserted += await _insert_rows_individually(url, headers, batch, errors)
 
+    skipped = len(articles) - inserted - len(errors)
     return inserted, skipped, errors
 
 
-def update_source_last_scraped(source_id):
+async def update_source_last_scraped(source_id):
     """Update the last_scraped_at timestamp for a news source"""
 
     headers = {
-        "Content-Type": "application/json",
-        "apikey": INSFORGE_API_KEY,
-        "Authorization": f"Bearer {INSFORGE_API_KEY}",
         "Prefer": "return=minimal"
     }
 
-    url = f"{INSFORGE_BASE_URL}/rest/v1/news_sources"
+    url = "/rest/v1/news_sources"
 
     try:
-        response = requests.patch(
+        response = await http_client.patch(
             url,
             headers=headers,
             json={"last_scraped_at": datetime.now().isoformat()},
@@ -146,6 +190,46 @@ def update_source_last_scraped(source_id):
         print(f"⚠ Exception updating last_scraped_at: {str(e)}")
 
 
+def iter_brightdata_articles(f):
+    """Yield the articles of a Bright Data JSON array from binary file `f`"""
+    if ijson is not None:
+        yield from ijson.items(f, "item", use_float=True)
+    else:
+        yield from json.load(f)
+
+
+def iter_parsed_articles(brightdata_articles, source_id):
+    """Yield InsForge rows for the valid articles"""
+    for article in brightdata_articles:
+        if article.get("content_type") == "article" and article.get("headline"):
+            yield parse_brightdata_article(article, source_id)
+
+
+async def import_articles(parsed_articles, source_id):
+    """Insert parsed articles batch by batch and bump the source timestamp over the shared client.
+
+    `parsed_articles` may be a lazy iterator; only one batch is held in memory.
+    Returns (parsed, inserted, skipped, errors).
+    """
+    parsed = inserted = skipped = 0
+    errors = []
+    try:
+        while batch := list(islice(parsed_articles, INSERT_BATCH_SIZE)):
+            parsed += len(batch)
+            batch_inserted, batch_skipped, batch_errors = await insert_articles_to_insforge(batch)
+            inserted += batch_inserted
+            skipped += batch_skipped
+            errors.extend(batch_errors)
+
+        # Update source timestamp
+        if inserted > 0:
+            await update_source_last_scraped(source_id)
+    finally:
+        await http_client.aclose()
+
+    return parsed, inserted, skipped, errors
+
+
 def main():
     if len(sys.argv) < 3:
         print("Usage: python import_brightdata_to_insforge.py <json_file_path> <source_name>")
@@ -164,35 +248,22 @@ def main():
 
     source_id = SOURCE_IDS[source_name]
 
-    # Load JSON file
+    print(f"\n📰 Importing articles from {source_name}...")
+    print(f"Source ID: {source_id}\n")
+
+    # Stream the JSON file: articles are parsed and inserted batch by batch
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            brightdata_articles = json.load(f)
+        with open(json_file, 'rb') as f:
+            parsed_articles = iter_parsed_articles(iter_brightdata_articles(f), source_id)
+            parsed, inserted, skipped, errors = asyncio.run(import_articles(parsed_articles, source_id))
     except FileNotFoundError:
         print(f"Error: File '{json_file}' not found")
         sys.exit(1)
-    except json.JSONDecodeError as e:
+    except JSON_ERRORS as e:
         print(f"Error: Invalid JSON in file '{json_file}': {str(e)}")
         sys.exit(1)
 
-    print(f"\n📰 Importing {len(brightdata_articles)} articles from {source_name}...")
-    print(f"Source ID: {source_id}\n")
-
-    # Parse articles
-    parsed_articles = []
-    for article in brightdata_articles:
-        if article.get("content_type") == "article" and article.get("headline"):
-            parsed = parse_brightdata_article(article, source_id)
-            parsed_articles.append(parsed)
-
-    print(f"Parsed {len(parsed_articles)} valid articles\n")
-
-    # Insert into InsForge
-    inserted, skipped, errors = insert_articles_to_insforge(parsed_articles)
-
-    # Update source timestamp
-    if inserted > 0:
-        update_source_last_scraped(source_id)
+    print(f"\nParsed {parsed} valid articles")
 
     # Summary
     print("\n" + "="*60)
@@ -33,8 +33,8 @@ echo ""
 echo "Step 2: Import scraped data into InsForge"
 echo "----------------------------------------------------------------------"
 
-# Find all JSON files in data/ directory from today
-TODAY=$(date +%Y%m%d)
+# Find all JSON files in data/ directory from today (filenames use UTC)
+TODAY=$(date -u +%Y%m%d)
 
 # Import each file
 for file in data/*_${TODAY}_*.json; do
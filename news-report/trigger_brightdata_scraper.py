@@ -4,11 +4,15 @@ Trigger Bright Data scraper via API and download results
 Usage: python trigger_brightdata_scraper.py
 """
 
+import asyncio
 import os
-import requests
+import random
+import tempfile
 import time
-import json
-from datetime import datetime
+from datetime import datetime, timezone
+import httpx
+import orjson
+from tenacity import retry, stop_after_attempt, wait_exponential_jitter
 
 # Bright Data Configuration
 BRIGHTDATA_API_TOKEN = os.environ.get("BRIGHTDATA_API_TOKEN", "")  # Set your token
@@ -22,8 +26,97 @@ SOURCES = {
     # "Straight Arrow News": "https://www.straightarrownews.com/"
 }
 
+# Downloaded snapshots go here (relative to the working directory); created
+# once at startup rather than on every download
+DATA_DIR = "data"
+os.makedirs(DATA_DIR, exist_ok=True)
+
+# One pooled HTTP/2 client for every Bright Data call; sources are scraped
+# concurrently, so their triggers and status polls share connections
+http_client = httpx.AsyncClient(
+    base_url=BRIGHTDATA_API_BASE,
+    headers={"Authorization": f"Bearer {BRIGHTDATA_API_TOKEN}"},
+    http2=True,
+    timeout=30.0,
+    limits=httpx.Limits(max_connections=32, max_keepalive_connections=8)
+)
+
+# Recent status responses per snapshot_id as (fetched_at, status), and a lock
+# per snapshot so concurrent polls of the same job share one request. The TTL
+# stays below wait_for_completion's base_delay so a poller's own re-poll
+# always sees a fresh status
+STATUS_CACHE_TTL = 0.5
+_status_cache = {}
+_status_locks = {}
+
+
+# Transient failures worth retrying: rate limiting and gateway/server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Only these are safe to replay blindly; a POST that failed mid-flight may
+# already have started a scrape
+IDEMPOTENT_METHODS = {"GET", "HEAD"}
+# Errors raised before the request was sent
+UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+RETRY_ATTEMPTS = 5
+RETRY_MAX_WAIT = 30.0
+
+_backoff = wait_exponential_jitter(initial=1, max=RETRY_MAX_WAIT)
+
+
+def _retry_wait(retry_state):
+    """Honor a Retry-After header (in seconds) if the server sent one, else back off exponentially"""
+    outcome = retry_state.outcome
+    if not outcome.failed:
+        retry_after = outcome.result().headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), RETRY_MAX_WAIT)
+    return _backoff(retry_state)
+
+
+def _should_retry(retry_state):
+    """Retry reads on any transport error or RETRY_STATUSES response. Other
+    methods retry only when the request never went out, or on a 429 that
+    says when to come back"""
+    method = retry_state.args[0] if retry_state.args else retry_state.kwargs["method"]
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+    outcome = retry_state.outcome
+    if outcome.failed:
+        error = outcome.exception()
+        return isinstance(error, httpx.TransportError if idempotent else UNSENT_ERRORS)
+    response = outcome.result()
+    if idempotent:
+        return response.status_code in RETRY_STATUSES
+    return response.status_code == 429 and "Retry-After" in response.headers
+
+
+@retry(
+    retry=_should_retry,
+    wait=_retry_wait,
+    stop=stop_after_attempt(RETRY_ATTEMPTS),
+    # Out of attempts: hand back the last response (or raise the last error)
+    retry_error_callback=lambda retry_state: retry_state.outcome.result()
+)
+async def send_with_retry(method, url, stream=False, **kwargs):
+    """Send a Bright Data request, retrying transient failures (see _should_retry).
+
+    With stream=True the body of a successful response is left unread for
+    the caller to iterate (and close); error bodies are always read.
+    """
+    response = await http_client.send(http_client.build_request(method, url, **kwargs), stream=stream)
+    if stream and response.is_error:
+        # Error bodies are small; reading them releases the connection before a retry
+        await response.aread()
+    return response
+
+
+def print_http_error(e):
+    """Print the status code and body of a failed response, if there was one"""
+    if isinstance(e, httpx.HTTPStatusError):
+        print(f"Status code: {e.response.status_code}")
+        print(f"Response: {e.response.text}")
+
 
-def trigger_scraper(url, collector_id=COLLECTOR_ID):
+async def trigger_scraper(url, collector_id=COLLECTOR_ID):
     """
     Trigger a Bright Data scraper job for a given URL using trigger_immediate
 
@@ -36,17 +129,11 @@ def trigger_scraper(url, collector_id=COLLECTOR_ID):
     """
 
     # API endpoint to trigger immediate collection
-    endpoint = f"{BRIGHTDATA_API_BASE}/trigger_immediate"
+    endpoint = "/trigger_immediate"
 
     # Request payload - simple URL object
     payload = {"url": url}
 
-    # Headers
-    headers = {
-        "Authorization": f"Bearer {BRIGHTDATA_API_TOKEN}",
-        "Content-Type": "application/json"
-    }
-
     # Query parameter
     params = {
         "collector": collector_id
@@ -54,16 +141,16 @@ def trigger_scraper(url, collector_id=COLLECTOR_ID):
 
     try:
         print(f"🚀 Triggering immediate scraper for: {url}")
-        response = requests.post(
+        response = await send_with_retry(
+            "POST",
             endpoint,
-            headers=headers,
             params=params,
-            json=payload,
-            timeout=30
+            headers={"Content-Type": "application/json"},
+            content=orjson.dumps(payload)
         )
 
         response.raise_for_status()
-        result = response.json()
+        result = orjson.loads(response.content)
 
         # Check for snapshot_id or response_id
         snapshot_id = result.get("snapshot_id")
@@ -80,15 +167,13 @@ def trigger_scraper(url, collector_id=COLLECTOR_ID):
             print(f"⚠️  Warning: No snapshot_id or response_id returned. Response: {result}")
             return None
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"✗ Error triggering scraper: {e}")
-        if hasattr(e, 'response') and e.response is not None:
-            print(f"Status code: {e.response.status_code}")
-            print(f"Response: {e.response.text}")
+        print_http_error(e)
         return None
 
 
-def check_job_status(snapshot_id):
+async def check_job_status(snapshot_id):
     """
     Check the status of a Bright Data scraping job
 
@@ -97,25 +182,32 @@ def check_job_status(snapshot_id):
 
     Returns:
         dict with status information
+
+    Responses are reused for STATUS_CACHE_TTL seconds, and concurrent calls
+    for the same snapshot wait for the request already in flight.
     """
 
-    endpoint = f"{BRIGHTDATA_API_BASE}/snapshot/{snapshot_id}"
+    endpoint = f"/snapshot/{snapshot_id}"
 
-    headers = {
-        "Authorization": f"Bearer {BRIGHTDATA_API_TOKEN}"
-    }
+    async with _status_locks.setdefault(snapshot_id, asyncio.Lock()):
+        cached = _status_cache.get(snapshot_id)
+        if cached is not None and time.monotonic() - cached[0] < STATUS_CACHE_TTL:
+            return cached[1]
 
-    try:
-        response = requests.get(endpoint, headers=headers, timeout=30)
-        response.raise_for_status()
-        return response.json()
+        try:
+            response = await send_with_retry("GET", endpoint)
+            response.raise_for_status()
+            status_info = orjson.loads(response.content)
 
-    except requests.exceptions.RequestException as e:
-        print(f"✗ Error checking status: {e}")
-        return None
+        except httpx.HTTPError as e:
+            print(f"✗ Error checking status: {e}")
+            return None
+
+        _status_cache[snapshot_id] = (time.monotonic(), status_info)
+        return status_info
 
 
-def download_results(snapshot_id, output_file=None):
+async def download_results(snapshot_id, output_file=None):
     """
     Download the results of a completed scraping job
 
@@ -127,57 +219,75 @@ def download_results(snapshot_id, output_file=None):
         Path to downloaded file or None
     """
 
-    endpoint = f"{BRIGHTDATA_API_BASE}/snapshot/{snapshot_id}"
-
-    headers = {
-        "Authorization": f"Bearer {BRIGHTDATA_API_TOKEN}"
-    }
+    endpoint = f"/snapshot/{snapshot_id}"
 
     # Query parameter to get the actual data
     params = {
         "format": "json"
     }
 
+    tmp_path = None
     try:
         print(f"📥 Downloading results for snapshot: {snapshot_id}")
-        response = requests.get(
+        response = await send_with_retry(
+            "GET",
             endpoint,
-            headers=headers,
             params=params,
-            timeout=60
+            timeout=60.0,
+            stream=True
         )
 
-        response.raise_for_status()
-        data = response.json()
-
-        # Generate output filename if not provided
-        if output_file is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_file = f"data/brightdata_{snapshot_id}_{timestamp}.json"
-
-        # Ensure data directory exists
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-
-        # Save to file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        try:
+            response.raise_for_status()
+
+            # Generate output filename if not provided
+            if output_file is None:
+                timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+                output_file = os.path.join(DATA_DIR, f"brightdata_{snapshot_id}_{timestamp}.json")
+
+            # DATA_DIR already exists; only a custom location needs creating
+            output_dir = os.path.dirname(output_file) or "."
+            if output_dir != DATA_DIR:
+                os.makedirs(output_dir, exist_ok=True)
+
+            # The snapshot is already JSON: stream it to a temp file as it
+            # arrives (memory stays at one chunk) and rename it into place
+            fd, tmp_path = tempfile.mkstemp(dir=output_dir, suffix=".part")
+            with open(fd, 'wb') as f:
+                async for chunk in response.aiter_bytes(64 * 1024):
+                    f.write(chunk)
+            os.replace(tmp_path, output_file)
+            tmp_path = None
+        finally:
+            await response.aclose()
 
         print(f"✓ Results saved to: {output_file}")
         return output_file
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         print(f"✗ Error downloading results: {e}")
         return None
 
+    finally:
+        if tmp_path is not None:
+            os.remove(tmp_path)
+
 
-def wait_for_completion(snapshot_id, max_wait_seconds=300, check_interval=10):
+async def wait_for_completion(snapshot_id, max_wait_seconds=300, base_delay=1.0, max_delay=15.0, jitter=1.0):
     """
     Poll the API until the job is complete or timeout
 
+    The delay between checks doubles from base_delay up to max_delay (plus up
+    to `jitter` random seconds), and drops back to base_delay whenever the
+    collected count grows, so short jobs are noticed quickly and long ones
+    are not over-polled.
+
     Args:
         snapshot_id: The snapshot ID to monitor
         max_wait_seconds: Maximum time to wait (default: 5 minutes)
-        check_interval: Seconds between status checks (default: 10 seconds)
+        base_delay: Seconds before the first re-check (default: 1 second)
+        max_delay: Longest wait between checks, before jitter (default: 15 seconds)
+        jitter: Maximum random seconds added to each wait (default: 1 second)
 
     Returns:
         True if completed successfully, False otherwise
@@ -185,9 +295,11 @@ def wait_for_completion(snapshot_id, max_wait_seconds=300, check_interval=10):
 
     print(f"⏳ Waiting for job {snapshot_id} to complete...")
 
-    elapsed = 0
-    while elapsed < max_wait_seconds:
-        status_info = check_job_status(snapshot_id)
+    deadline = time.monotonic() + max_wait_seconds
+    attempts = 0
+    last_collected = 0
+    while time.monotonic() < deadline:
+        status_info = await check_job_status(snapshot_id)
 
         if status_info is None:
             print(f"⚠ Could not check status")
@@ -207,14 +319,20 @@ def wait_for_completion(snapshot_id, max_wait_seconds=300, check_interval=10):
             print(f"✗ Job {status}")
             return False
 
-        time.sleep(check_interval)
-        elapsed += check_interval
+        # Poll fast again while the job is making progress
+        if collected > last_collected:
+            attempts = 0
+        last_collected = collected
+
+        delay = min(max_delay, base_delay * 2 ** attempts) + random.uniform(0, jitter)
+        await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+        attempts += 1
 
     print(f"⏱ Timeout waiting for job to complete")
     return False
 
 
-def scrape_news_source(source_name, source_url):
+async def scrape_news_source(source_name, source_url):
     """
     Complete workflow: trigger scraper, wait for completion, download results
 
@@ -226,34 +344,36 @@ def scrape_news_source(source_name, source_url):
         Path to downloaded file or None
     """
 
+    # Name the output after when this scrape started (UTC, like the
+    # import script's `date -u` glob), once for the whole workflow
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    output_file = os.path.join(DATA_DIR, f"{source_name.lower().replace(' ', '_')}_{timestamp}.json")
+
     print(f"\n{'='*60}")
     print(f"Scraping {source_name}")
     print(f"{'='*60}")
 
     # Step 1: Trigger the scraper
-    snapshot_id = trigger_scraper(source_url)
+    snapshot_id = await trigger_scraper(source_url)
 
     if snapshot_id is None:
         print(f"Failed to trigger scraper for {source_name}")
         return None
 
     # Step 2: Wait for completion
-    success = wait_for_completion(snapshot_id, max_wait_seconds=300)
+    success = await wait_for_completion(snapshot_id, max_wait_seconds=300)
 
     if not success:
         print(f"Scraping job did not complete successfully for {source_name}")
         return None
 
     # Step 3: Download results
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = f"data/{source_name.lower().replace(' ', '_')}_{timestamp}.json"
-
-    result_file = download_results(snapshot_id, output_file)
+    result_file = await download_results(snapshot_id, output_file)
 
     return result_file
 
 
-def main():
+async def main():
     """
     Main function to scrape all configured news sources
     """
@@ -268,11 +388,16 @@ def main():
     print(f"Collector ID: {COLLECTOR_ID}")
     print(f"Sources to scrape: {len(SOURCES)}\n")
 
-    results = {}
-
-    for source_name, source_url in SOURCES.items():
-        result_file = scrape_news_source(source_name, source_url)
-        results[source_name] = result_file
+    # Each source spends most of its time waiting on Bright Data, so scrape
+    # them all at once: total time is the slowest source, not the sum
+    try:
+        result_files = await asyncio.gather(*(
+            scrape_news_source(source_name, source_url)
+            for source_name, source_url in SOURCES.items()
+        ))
+    finally:
+        await http_client.aclose()
+    results = dict(zip(SOURCES, result_files))
 
     # Summary
     print(f"\n{'='*60}")
@@ -295,4 +420,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -0,0 +1,238 @@
+"""
+Script and TTS building blocks shared by the podcast generators.
+
+The API (generate_podcast.py), the cron script
+(generate_and_store_podcast.py) and the seed script (seed_podcast.py) all
+stream the script from the LLM sentence by sentence and feed it to
+ElevenLabs in batches; they only differ in where the audio and the TTS
+cache live.
+"""
+
+import asyncio
+import hashlib
+import os
+
+import script_cache
+from article_prep import dedupe_articles, truncate_tokens
+from sentence_buffer import SentenceBuffer, split_sentences
+
+# ElevenLabs voice settings
+VOICE_ID = "UgBBYS2sOqTuMpoF3BR0"  # Professional news anchor voice
+MODEL_ID = "eleven_multilingual_v2"
+OUTPUT_FORMAT = "mp3_44100_128"
+# ElevenLabs optimize_streaming_latency level (0-4); trades some text
+# normalization for a faster first audio byte
+TTS_LATENCY = int(os.getenv("TTS_LATENCY", "3"))
+
+# ElevenLabs "mp3_44100_128" output is constant bitrate, so duration follows from size
+MP3_BITRATE = 128_000
+
+SCRIPT_MODEL = "gpt-5-mini"
+
+
+PROMPT_TEMPLATE = """You are a professional news anchor creating a 2-3 minute broadcast script.
+
+Create a politically neutral, natural and engaging news broadcast from these {n} top stories:
+
+{articles_text}
+
+Requirements:
+- Start with a warm greeting and introduction (Your company: Neutral Network)
+- This is a monologue, so never need to label who is saying what (i.e. no need to say Anchor: text, just say text)
+- No settings or exposition (no need to say intro music, outro music, etc.)
+- Present each story in a conversational, professional tone
+- Use smooth transitions between stories
+- Keep it concise but informative
+- End with a brief closing statement
+
+The complete script"""
+
+STORY_TEMPLATE = """
+Story {i}: {title}
+Source: {source}
+Content: {content}
+---
+"""
+
+
+def create_news_prompt(articles):
+    """Format articles into a news anchor script prompt"""
+    articles = dedupe_articles(articles)
+    parts = [
+        STORY_TEMPLATE.format(
+            i=i,
+            title=article["title"],
+            source=article.get("source_name", "Unknown"),
+            content=truncate_tokens(article.get("content") or article.get("summary") or "No content available"),
+        )
+        for i, article in enumerate(articles, 1)
+    ]
+    return PROMPT_TEMPLATE.format(articles_text="".join(parts), n=len(articles))
+
+
+def chat_request(articles, system_message):
+    """Chat Completions request body for one script"""
+    return {
+        "model": SCRIPT_MODEL,
+        "messages": [
+            system_message,
+            {"role": "user", "content": create_news_prompt(articles)}
+        ]
+    }
+
+
+async def _semantic_lookup(openai_client, articles):
+    """Embed the article titles and look for a close cached script: (embedding, script or None)"""
+    # A failing embedding request only disables the semantic tier
+    try:
+        embedding = await script_cache.embed_titles(openai_client, articles)
+        return embedding, await asyncio.to_thread(script_cache.get_similar, embedding)
+    except Exception as e:
+        print(f"⚠️ Semantic cache lookup failed: {e}")
+        return None, None
+
+
+async def _open_stream(openai_client, request):
+    """Start a streamed chat completion and wait for its first event: (stream, events, first event)"""
+    stream = await openai_client.chat.completions.create(**request, stream=True)
+    try:
+        events = aiter(stream)
+        return stream, events, await anext(events, None)
+    except BaseException:
+        await stream.close()
+        raise
+
+
+async def stream_script_sentences(openai_client, articles, system_message):
+    """Stream the script from GPT-5-mini, yielding each sentence as soon as it is complete.
+
+    A script cached for the same article set, or for one whose titles are
+    semantically close enough (within the cache TTL), is replayed sentence
+    by sentence without calling the LLM. The semantic lookup races the LLM
+    stream, so it only costs time when it finds a script.
+    """
+    key = script_cache.cache_key(articles)
+    cached = await asyncio.to_thread(script_cache.get_exact, key)
+    if cached is not None:
+        script_cache.record("exact", cached)
+        for sentence in split_sentences(cached):
+            yield sentence
+        return
+
+    semantic = asyncio.create_task(_semantic_lookup(openai_client, articles))
+    opening = asyncio.create_task(_open_stream(openai_client, chat_request(articles, system_message)))
+    await asyncio.wait({semantic, opening}, return_when=asyncio.FIRST_COMPLETED)
+
+    embedding = None
+    if semantic.done():
+        embedding, cached = semantic.result()
+    if cached is not None:
+        # Found before the first token: drop the LLM stream
+        if not opening.done():
+            opening.cancel()
+        elif opening.exception() is None:
+            await opening.result()[0].close()
+        await asyncio.to_thread(script_cache.put, key, cached, embedding)
+        script_cache.record("semantic", cached)
+        for sentence in split_sentences(cached):
+            yield sentence
+        return
+
+    script_cache.record("miss")
+    print("🤖 Streaming news anchor script with OpenAI GPT-5-mini...")
+    parts = []
+    buffer = SentenceBuffer()
+    stream = None
+    try:
+        stream, events, event = await opening
+        while event is not None:
+            if event.choices:
+                for sentence in buffer.feed(event.choices[0].delta.content or ""):
+                    parts.append(sentence)
+                    yield sentence
+            event = await anext(events, None)
+    except BaseException:
+        semantic.cancel()
+        if stream is not None:
+            await stream.close()
+        raise
+    rest = buffer.flush()
+    if rest.strip():
+        parts.append(rest)
+        yield rest
+
+    # The embedding is stored with the script for later semantic lookups
+    embedding, _ = await semantic
+    script = "".join(parts).strip()
+    await asyncio.to_thread(script_cache.put, key, script, embedding)
+    print(f"✓ Script generated ({len(script)} characters)")
+
+
+async def record_sentences(sentences, parts):
+    """Pass sentences through while collecting them, so the full script can be stored afterwards"""
+    async for sentence in sentences:
+        parts.append(sentence)
+        yield sentence
+
+
+async def batch_sentences(sentences, is_cached, chunk_chars=700, first_alone=False):
+    """Group streamed sentences into TTS requests as they arrive.
+
+    Sentences that queue up while the caller is synthesizing the previous
+    batch are joined into the next one (up to ~`chunk_chars` characters).
+    Sentences for which `is_cached(text)` is true are never merged into a
+    batch, so their cached audio is reused. With `first_alone` the first
+    sentence is yielded on its own so the first audio bytes come back quickly.
+    """
+    queue = asyncio.Queue()
+    done = object()
+
+    async def collect():
+        try:
+            async for sentence in sentences:
+                await queue.put(sentence)
+        finally:
+            await queue.put(done)
+
+    collector = asyncio.create_task(collect())
+    first = True
+    carry = None
+    try:
+        while True:
+            text = carry if carry is not None else await queue.get()
+            carry = None
+            if text is done:
+                break
+            standalone = (first and first_alone) or is_cached(text)
+            while not standalone and len(text) < chunk_chars and not queue.empty():
+                sentence = queue.get_nowait()
+                if sentence is done or is_cached(sentence):
+                    carry = sentence
+                    break
+                text += sentence
+            first = False
+
+            yield text
+
+        # Surface errors from the LLM stream
+        await collector
+    finally:
+        if not collector.done():
+            collector.cancel()
+
+
+def tts_cache_key(text):
+    """Content hash identifying the audio ElevenLabs produces for `text`"""
+    return hashlib.sha256(f"{VOICE_ID}|{MODEL_ID}|{OUTPUT_FORMAT}|{TTS_LATENCY}|{text}".encode()).hexdigest()[:32]
+
+
+def audio_duration_seconds(num_bytes, output_format=OUTPUT_FORMAT):
+    """Duration of `num_bytes` of ElevenLabs `output_format` audio (e.g. "mp3_44100_128", "pcm_24000")"""
+    codec, sample_rate, *bitrate = output_format.split("_")
+    if codec == "pcm":
+        # 16-bit mono samples
+        return round(num_bytes / (int(sample_rate) * 2))
+    if codec in ("ulaw", "alaw"):
+        return round(num_bytes / int(sample_rate))
+    # Compressed formats are constant bitrate (kbps in the format name)
+    return round(num_bytes * 8 / (int(bitrate[0]) * 1000 if bitrate else MP3_BITRATE))
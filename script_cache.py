@@ -0,0 +1,158 @@
+"""
+Cache for generated podcast scripts.
+
+Skips the LLM call when the same (or nearly the same) set of articles has
+already been turned into a script:
+- Exact tier: sha256 of sorted article ids + source names + PROMPT_VERSION
+- Semantic tier: cosine similarity of article-title embeddings
+
+Bump PROMPT_VERSION whenever the prompt template changes to invalidate
+old entries. Entries older than TTL_SECONDS are ignored so the same
+article set regenerates at most once a day.
+
+The lookups are blocking sqlite calls; async code runs them through
+asyncio.to_thread.
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+PROMPT_VERSION = "v2"
+EMBEDDING_MODEL = "text-embedding-3-small"
+SEMANTIC_THRESHOLD = 0.97
+
+CACHE_PATH = Path(os.getenv("SCRIPT_CACHE_PATH", Path(__file__).parent / "script_cache.sqlite3"))
+TTL_SECONDS = int(os.getenv("SCRIPT_CACHE_TTL", str(24 * 3600)))
+
+# Rough chars-per-token ratio used to estimate completion tokens saved by hits
+_CHARS_PER_TOKEN = 4
+
+# Process-wide hit/miss counters
+stats = {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "tokens_saved": 0}
+
+# One connection per process, shared by the to_thread workers under a lock
+_conn = None
+_conn_lock = threading.Lock()
+
+
+def _source_name(article):
+    """Source name from either a flat `source_name` or a joined `news_sources` row"""
+    if article.get("source_name"):
+        return article["source_name"]
+    sources = article.get("news_sources")
+    return sources.get("name", "Unknown") if isinstance(sources, dict) else "Unknown"
+
+
+def cache_key(articles):
+    """Exact cache key for an article set.
+
+    Source names are part of the key so the same story from a different
+    outlet never reuses a script attributed to the wrong source.
+    """
+    ids = sorted(f"{a.get('id')}:{_source_name(a)}" for a in articles)
+    return hashlib.sha256(("|".join(ids) + PROMPT_VERSION).encode()).hexdigest()
+
+
+def _connect():
+    """The process-wide connection, creating the schema on first use. Hold _conn_lock while using it."""
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS script_cache("
+            "key TEXT PRIMARY KEY, script TEXT, embedding TEXT, prompt_version TEXT, created_at INTEGER)"
+        )
+    return _conn
+
+
+def record(kind, script=None):
+    """Count a cache lookup outcome (kind is "exact", "semantic" or "miss")"""
+    if kind == "miss":
+        stats["misses"] += 1
+        return
+    stats[f"{kind}_hits"] += 1
+    stats["tokens_saved"] += len(script or "") // _CHARS_PER_TOKEN
+    print(f"✓ Script cache hit ({kind})")
+
+
+def get_exact(key):
+    """Return the cached script for `key`, or None"""
+    with _conn_lock, _connect() as conn:
+        row = conn.execute(
+            "SELECT script FROM script_cache WHERE key = ? AND created_at >= ?",
+            (key, int(time.time()) - TTL_SECONDS)
+        ).fetchone()
+    return row[0] if row else None
+
+
+def get_similar(embedding, threshold=SEMANTIC_THRESHOLD):
+    """Return the cached script whose embedding is closest to `embedding` if above `threshold`"""
+    best_score, best_script = 0.0, None
+    with _conn_lock, _connect() as conn:
+        rows = conn.execute(
+            "SELECT script, embedding FROM script_cache "
+            "WHERE embedding IS NOT NULL AND prompt_version = ? AND created_at >= ?",
+            (PROMPT_VERSION, int(time.time()) - TTL_SECONDS)
+        ).fetchall()
+    for script, stored in rows:
+        # Vectors are stored normalized, so the dot product is the cosine similarity
+        score = sum(x * y for x, y in zip(embedding, json.loads(stored)))
+        if score > best_score:
+            best_score, best_script = score, script
+    return best_script if best_score >= threshold else None
+
+
+def put(key, script, embedding=None):
+    """Store a generated script (and optionally its title embedding)"""
+    with _conn_lock, _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO script_cache(key, script, embedding, prompt_version, created_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, script, json.dumps(embedding) if embedding else None, PROMPT_VERSION, int(time.time()))
+        )
+
+
+async def embed_titles(openai_client, articles):
+    """Embed the concatenated article titles + sources, normalized to unit length"""
+    text = "\n".join(f"{a.get('title', '')} ({_source_name(a)})" for a in articles)
+    response = await openai_client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+    vector = response.data[0].embedding
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+async def get_or_generate(openai_client, articles, generate):
+    """Return a cached script for `articles`, or call `generate()` and cache the result.
+
+    Checks the exact tier first, then the semantic tier. A failing
+    embedding request only disables the semantic tier for this call.
+    """
+    key = cache_key(articles)
+    script = await asyncio.to_thread(get_exact, key)
+    if script is not None:
+        record("exact", script)
+        return script
+
+    embedding = None
+    try:
+        embedding = await embed_titles(openai_client, articles)
+        script = await asyncio.to_thread(get_similar, embedding)
+    except Exception as e:
+        print(f"⚠️ Semantic cache lookup failed: {e}")
+
+    if script is not None:
+        record("semantic", script)
+        await asyncio.to_thread(put, key, script, embedding)
+        return script
+
+    record("miss")
+    script = await generate()
+    await asyncio.to_thread(put, key, script, embedding)
+    return script
@@ -5,8 +5,12 @@ Usage: python3 seed-articles-api.py
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import orjson
 import requests
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -26,37 +30,97 @@ headers = {
     "Prefer": "return=representation"
 }
 
-def create_tables():
-    """Check if tables exist by trying to query them"""
-    print("🔍 Checking if tables exist...")
+# One session for every call, so they all reuse a single TCP/TLS connection.
+# Connection errors, 429s and 5xx responses are retried with exponential
+# backoff (honoring Retry-After); POSTs are retried too since every insert
+# is an idempotent upsert
+session = requests.Session()
+session.headers.update(headers)
+session.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=None,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+))
 
-    # Try to query news_sources
-    try:
-        response = requests.get(
-            f"{INSFORGE_BASE_URL}/rest/v1/news_sources",
-            headers=headers,
-            params={"limit": 1}
-        )
-        if response.status_code == 200:
-            print("✓ news_sources table exists")
-        else:
-            print(f"⚠️  news_sources table might not exist (status: {response.status_code})")
-    except Exception as e:
-        print(f"⚠️  Error checking news_sources: {e}")
+# Test articles; published_at is filled in relative to the time of seeding
+ARTICLE_TEMPLATES = (
+    {
+        "title": "AI Regulation Bill Passes Senate Committee",
+        "content": "The Senate Commerce Committee approved landmark legislation today that would establish federal oversight of artificial intelligence systems. The bipartisan bill, supported by both Democrats and Republicans, aims to create safety standards for AI models while promoting innovation. Proponents argue it provides necessary guardrails, while critics worry it may stifle technological progress. The bill now moves to the full Senate for consideration.",
+        "url": "https://www.bbc.com/news/technology-ai-regulation-2025",
+        "hours_ago": 2,
+        "source": "BBC"
+    },
+    {
+        "title": "Federal Reserve Holds Interest Rates Steady",
+        "content": "The Federal Reserve announced it will maintain current interest rates following its policy meeting, citing stable inflation and steady economic growth. Fed Chair Jerome Powell stated the central bank remains data-dependent and will adjust policy as needed. Markets responded positively to the decision, with major indices gaining ground. Economists predict rates will remain unchanged through the end of the year.",
+        "url": "https://www.reuters.com/markets/fed-rates-2025",
+        "hours_ago": 3,
+        "source": "Reuters"
+    },
+    {
+        "title": "Bipartisan Infrastructure Projects Break Ground Nationwide",
+        "content": "Construction began today on dozens of infrastructure projects across the country, funded by the 2021 bipartisan infrastructure law. Projects include bridge repairs, highway expansions, and broadband deployment in rural areas. Transportation Secretary Pete Buttigieg toured sites in three states, highlighting the economic benefits and job creation. Both parties claimed credit for the achievements during separate press conferences.",
+        "url": "https://www.straightarrownews.com/politics/infrastructure-projects-2025",
+        "hours_ago": 4,
+        "source": "Straight Arrow News"
+    },
+    {
+        "title": "Tech Companies Announce Voluntary AI Safety Commitments",
+        "content": "Major technology companies including Google, Microsoft, and OpenAI pledged new voluntary safety commitments for AI development. The agreements include increased transparency, third-party audits, and investment in AI safety research. The White House praised the commitments as a positive step, though some advocates argue binding regulations are still necessary. The announcements come amid growing calls for AI governance.",
+        "url": "https://www.bbc.com/news/technology-ai-safety-2025",
+        "hours_ago": 5,
+        "source": "BBC"
+    },
+    {
+        "title": "Supreme Court Agrees to Hear Social Media Regulation Case",
+        "content": "The U.S. Supreme Court will hear arguments on the constitutionality of state laws regulating social media platforms. The cases from Texas and Florida involve restrictions on content moderation practices. Tech industry groups argue the laws violate free speech rights, while state officials contend platforms have too much power. Legal experts call it one of the most significant First Amendment cases in decades.",
+        "url": "https://www.reuters.com/legal/supreme-court-social-media-2025",
+        "hours_ago": 6,
+        "source": "Reuters"
+    }
+)
 
-    # Try to query news_articles
-    try:
-        response = requests.get(
+INSERT_CONCURRENCY = 8
+ARTICLE_INSERT_HEADERS = {"Prefer": "return=representation,resolution=ignore-duplicates"}
+
+def insert_articles_individually(articles):
+    """Insert articles one per request (concurrently, over the shared session) to isolate rows a bulk insert rejected"""
+    def insert_one(article):
+        return article, session.post(
             f"{INSFORGE_BASE_URL}/rest/v1/news_articles",
-            headers=headers,
-            params={"limit": 1}
+            headers=ARTICLE_INSERT_HEADERS,
+            params={"on_conflict": "url"},
+            data=orjson.dumps([article])
         )
-        if response.status_code == 200:
-            print("✓ news_articles table exists")
-        else:
-            print(f"⚠️  news_articles table might not exist (status: {response.status_code})")
-    except Exception as e:
-        print(f"⚠️  Error checking news_articles: {e}")
+
+    inserted_count = 0
+    # requests releases the GIL while waiting on the network, so the POSTs overlap
+    with ThreadPoolExecutor(max_workers=INSERT_CONCURRENCY) as executor:
+        futures = [executor.submit(insert_one, article) for article in articles]
+        for future in as_completed(futures):
+            try:
+                article, response = future.result()
+            except Exception as e:
+                print(f"✗ Error inserting article: {e}")
+                continue
+            if response.status_code in [200, 201]:
+                if orjson.loads(response.content):
+                    inserted_count += 1
+                    print(f"✓ Inserted: {article['title'][:50]}...")
+                else:
+                    print(f"⚠️  Already exists: {article['title'][:50]}...")
+            else:
+                print(f"✗ Failed to insert article: {response.status_code}")
+                print(f"  Response: {response.text}")
+    return inserted_count
 
 def insert_news_sources():
     """Insert news sources"""
@@ -70,41 +134,39 @@ def insert_news_sources():
 
     source_ids = {}
 
-    for source in sources:
-        try:
-            # Try to insert
-            response = requests.post(
+    try:
+        # One upsert for all sources: existing rows (same name) come back too,
+        # so no per-source 409 + lookup round trip is needed
+        response = session.post(
+            f"{INSFORGE_BASE_URL}/rest/v1/news_sources",
+            headers={"Prefer": "return=representation,resolution=merge-duplicates"},
+            params={"on_conflict": "name"},
+            data=orjson.dumps(sources)
+        )
+
+        if response.status_code in [200, 201]:
+            for row in orjson.loads(response.content):
+                source_ids[row["name"]] = row.get("id")
+                print(f"✓ Upserted {row['name']} (id: {row.get('id')})")
+        else:
+            print(f"✗ Failed to insert news sources: {response.status_code}")
+            print(f"  Response: {response.text}")
+
+        # Older PostgREST versions leave untouched duplicates out of the
+        # response; look up whatever is missing in one query
+        missing = [source["name"] for source in sources if source["name"] not in source_ids]
+        if missing and response.status_code in [200, 201]:
+            names = ",".join(f'"{name}"' for name in missing)
+            get_response = session.get(
                 f"{INSFORGE_BASE_URL}/rest/v1/news_sources",
-                headers=headers,
-                json=source
+                params={"name": f"in.({names})", "select": "id,name"}
             )
-
-            if response.status_code in [200, 201]:
-                result = response.json()
-                if isinstance(result, list) and len(result) > 0:
-                    source_id = result[0].get("id")
-                else:
-                    source_id = result.get("id")
-                source_ids[source["name"]] = source_id
-                print(f"✓ Inserted {source['name']} (id: {source_id})")
-            elif response.status_code == 409:
-                # Already exists, fetch the ID
-                print(f"⚠️  {source['name']} already exists, fetching ID...")
-                get_response = requests.get(
-                    f"{INSFORGE_BASE_URL}/rest/v1/news_sources",
-                    headers=headers,
-                    params={"name": f"eq.{source['name']}", "select": "id"}
-                )
-                if get_response.status_code == 200:
-                    results = get_response.json()
-                    if results:
-                        source_ids[source["name"]] = results[0]["id"]
-                        print(f"✓ Found {source['name']} (id: {source_ids[source['name']]})")
-            else:
-                print(f"✗ Failed to insert {source['name']}: {response.status_code}")
-                print(f"  Response: {response.text}")
-        except Exception as e:
-            print(f"✗ Error inserting {source['name']}: {e}")
+            if get_response.status_code == 200:
+                for row in orjson.loads(get_response.content):
+                    source_ids[row["name"]] = row["id"]
+                    print(f"✓ Found {row['name']} (id: {row['id']})")
+    except Exception as e:
+        print(f"✗ Error inserting news sources: {e}")
 
     return source_ids
 
@@ -112,70 +174,53 @@ def insert_articles(source_ids):
     """Insert test articles"""
     print("\n📝 Inserting test articles...")
 
-    now = datetime.now()
+    now = datetime.now(timezone.utc)
 
     articles = [
         {
-            "title": "AI Regulation Bill Passes Senate Committee",
-            "content": "The Senate Commerce Committee approved landmark legislation today that would establish federal oversight of artificial intelligence systems. The bipartisan bill, supported by both Democrats and Republicans, aims to create safety standards for AI models while promoting innovation. Proponents argue it provides necessary guardrails, while critics worry it may stifle technological progress. The bill now moves to the full Senate for consideration.",
-            "url": "https://www.bbc.com/news/technology-ai-regulation-2025",
-            "published_at": (now - timedelta(hours=2)).isoformat(),
-            "source_id": source_ids.get("BBC")
-        },
-        {
-            "title": "Federal Reserve Holds Interest Rates Steady",
-            "content": "The Federal Reserve announced it will maintain current interest rates following its policy meeting, citing stable inflation and steady economic growth. Fed Chair Jerome Powell stated the central bank remains data-dependent and will adjust policy as needed. Markets responded positively to the decision, with major indices gaining ground. Economists predict rates will remain unchanged through the end of the year.",
-            "url": "https://www.reuters.com/markets/fed-rates-2025",
-            "published_at": (now - timedelta(hours=3)).isoformat(),
-            "source_id": source_ids.get("Reuters")
-        },
-        {
-            "title": "Bipartisan Infrastructure Projects Break Ground Nationwide",
-            "content": "Construction began today on dozens of infrastructure projects across the country, funded by the 2021 bipartisan infrastructure law. Projects include bridge repairs, highway expansions, and broadband deployment in rural areas. Transportation Secretary Pete Buttigieg toured sites in three states, highlighting the economic benefits and job creation. Both parties claimed credit for the achievements during separate press conferences.",
-            "url": "https://www.straightarrownews.com/politics/infrastructure-projects-2025",
-            "published_at": (now - timedelta(hours=4)).isoformat(),
-            "source_id": source_ids.get("Straight Arrow News")
-        },
-        {
-            "title": "Tech Companies Announce Voluntary AI Safety Commitments",
-            "content": "Major technology companies including Google, Microsoft, and OpenAI pledged new voluntary safety commitments for AI development. The agreements include increased transparency, third-party audits, and investment in AI safety research. The White House praised the commitments as a positive step, though some advocates argue binding regulations are still necessary. The announcements come amid growing calls for AI governance.",
-            "url": "https://www.bbc.com/news/technology-ai-safety-2025",
-            "published_at": (now - timedelta(hours=5)).isoformat(),
-            "source_id": source_ids.get("BBC")
-        },
-        {
-            "title": "Supreme Court Agrees to Hear Social Media Regulation Case",
-            "content": "The U.S. Supreme Court will hear arguments on the constitutionality of state laws regulating social media platforms. The cases from Texas and Florida involve restrictions on content moderation practices. Tech industry groups argue the laws violate free speech rights, while state officials contend platforms have too much power. Legal experts call it one of the most significant First Amendment cases in decades.",
-            "url": "https://www.reuters.com/legal/supreme-court-social-media-2025",
-            "published_at": (now - timedelta(hours=6)).isoformat(),
-            "source_id": source_ids.get("Reuters")
+            "title": template["title"],
+            "content": template["content"],
+            "url": template["url"],
+            "published_at": (now - timedelta(hours=template["hours_ago"])).isoformat(),
+            "source_id": source_ids.get(template["source"])
         }
+        for template in ARTICLE_TEMPLATES
     ]
 
-    inserted_count = 0
-
+    valid_articles = []
     for article in articles:
         if not article["source_id"]:
             print(f"⚠️  Skipping article (no source_id): {article['title']}")
             continue
+        valid_articles.append(article)
 
-        try:
-            response = requests.post(
-                f"{INSFORGE_BASE_URL}/rest/v1/news_articles",
-                headers=headers,
-                json=article
-            )
+    inserted_count = 0
 
-            if response.status_code in [200, 201]:
-                inserted_count += 1
+    try:
+        # One bulk insert; articles whose url already exists are skipped
+        # server-side and left out of the response
+        response = session.post(
+            f"{INSFORGE_BASE_URL}/rest/v1/news_articles",
+            headers=ARTICLE_INSERT_HEADERS,
+            params={"on_conflict": "url"},
+            data=orjson.dumps(valid_articles)
+        )
+
+        if response.status_code in [200, 201]:
+            inserted = orjson.loads(response.content)
+            inserted_count = len(inserted)
+            for article in inserted:
                 print(f"✓ Inserted: {article['title'][:50]}...")
-            elif response.status_code == 409:
-                print(f"⚠️  Already exists: {article['title'][:50]}...")
-            else:
-                print(f"✗ Failed to insert article: {response.status_code}")
-                print(f"  Response: {response.text}")
-        except Exception as e:
-            print(f"✗ Error inserting article: {e}")
+            skipped = len(valid_articles) - inserted_count
+            if skipped:
+                print(f"⚠️  {skipped} articles already exist")
+        else:
+            # One bad row fails the whole batch; fall back to per-row inserts
+            print(f"✗ Bulk insert failed: {response.status_code}, inserting one by one")
+            print(f"  Response: {response.text}")
+            inserted_count = insert_articles_individually(valid_articles)
+    except Exception as e:
+        print(f"✗ Error inserting articles: {e}")
 
     print(f"\n✅ Inserted {inserted_count} new articles")
 
@@ -184,9 +229,8 @@ def verify_articles():
     print("\n🔍 Verifying articles...")
 
     try:
-        response = requests.get(
+        response = session.get(
             f"{INSFORGE_BASE_URL}/rest/v1/news_articles",
-            headers=headers,
             params={
                 "select": "title,published_at,news_sources(name)",
                 "order": "published_at.desc",
@@ -195,7 +239,7 @@ def verify_articles():
         )
 
         if response.status_code == 200:
-            articles = response.json()
+            articles = orjson.loads(response.content)
             print(f"\n✅ Found {len(articles)} articles:")
             for i, article in enumerate(articles, 1):
                 source = article.get("news_sources", {})
@@ -212,7 +256,6 @@ def main():
     print("🌱 Seeding Test Articles to InsForge")
     print("=" * 70)
 
-    create_tables()
     source_ids = insert_news_sources()
 
     if not source_ids:
@@ -222,6 +265,8 @@ def main():
     insert_articles(source_ids)
     verify_articles()
 
+    session.close()
+
     print("\n" + "=" * 70)
     print("✅ Seeding complete!")
     print("=" * 70)
@@ -7,9 +7,13 @@ This script fetches articles via SQL, generates a script, creates audio, and upl
 import asyncio
 import os
 import sys
+import time
+from contextlib import aclosing
 from pathlib import Path
-from datetime import datetime
+from queue import SimpleQueue
+from datetime import datetime, timezone
 from dotenv import load_dotenv
+import httpx
 
 # Load environment variables
 load_dotenv(".env", override=True)
@@ -20,133 +24,156 @@ sys.path.append(str(Path(__file__).parent / "news-report"))
 from elevenlabs.client import ElevenLabs
 from openai import AsyncOpenAI
 
+from multipart_stream import multipart_file
+from podcast_pipeline import (
+    MODEL_ID, OUTPUT_FORMAT, TTS_LATENCY, VOICE_ID,
+    batch_sentences, record_sentences, stream_script_sentences
+)
+
 # Configuration
 INSFORGE_BASE_URL = os.getenv("INSFORGE_BASE_URL", "https://sv7kpi43.us-east.insforge.app")
 INSFORGE_API_KEY = os.getenv("INSFORGE_API_KEY")
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Local copies of generated episodes
+AUDIO_DIR = Path(__file__).parent / "news-report" / "audio-data"
+AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+
 # Create clients
 elevenlabs_client = ElevenLabs(api_key=ELEVENLABS_API_KEY)
 openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY)
 
+# One pooled HTTP/2 client for InsForge, so every upload in the process
+# shares the TCP/TLS connection instead of handshaking per call
+http_client = httpx.AsyncClient(
+    base_url=INSFORGE_BASE_URL,
+    headers={
+        "apikey": INSFORGE_API_KEY,
+        "Authorization": f"Bearer {INSFORGE_API_KEY}"
+    },
+    http2=True,
+    timeout=httpx.Timeout(120.0, connect=10.0),
+    limits=httpx.Limits(max_connections=8, max_keepalive_connections=8)
+)
 
-def create_news_prompt(articles):
-    """Format articles into a news anchor script prompt"""
-    articles_text = ""
-    for i, article in enumerate(articles, 1):
-        source = article.get("source_name", "Unknown")
-        content = article.get("content") or article.get("summary") or "No content available"
-
-        articles_text += f"""
-Story {i}: {article['title']}
-Source: {source}
-Content: {content}
----
-"""
-
-    return f"""You are a professional news anchor creating a 2-3 minute broadcast script.
-
-Create a politically neutral, natural and engaging news broadcast from these {len(articles)} top stories:
-
-{articles_text}
 
-Requirements:
-- Start with a warm greeting and introduction (Your company: Neutral Network)
-- This is a monologue, so never need to label who is saying what (i.e. no need to say Anchor: text, just say text)
-- No settings or exposition (no need to say intro music, outro music, etc.)
-- Present each story in a conversational, professional tone
-- Use smooth transitions between stories
-- Keep it concise but informative
-- End with a brief closing statement
+SYSTEM_MESSAGE = {"role": "system", "content": "You are a professional news anchor writer."}
 
-The complete script"""
 
+async def generate_and_upload_audio(sentences, chunk_chars=700):
+    """Convert streamed script sentences to audio using ElevenLabs and stream it into InsForge Storage.
 
-async def generate_script(articles):
-    """Generate news script using OpenAI GPT-5-mini"""
-    print("🤖 Generating news anchor script with OpenAI GPT-5-mini...")
+    Script generation, TTS and upload all overlap: sentences that queue up
+    while a TTS request is running are sent together in the next request
+    (up to ~`chunk_chars` characters), and each audio chunk goes to the
+    upload as soon as it arrives. A local copy is written alongside.
+    Returns (audio_file, public_url); public_url is None if the upload failed.
+    """
+    print("🎙️ Generating audio with ElevenLabs and uploading to InsForge Storage...")
 
-    prompt = create_news_prompt(articles)
+    # Save to file
+    # One UTC timestamp names both the local copy and the uploaded object
+    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d_%H-%M-%S")
+    audio_file = AUDIO_DIR / f"news_podcast_{timestamp}.mp3"
 
-    response = await openai_client.chat.completions.create(
-        model="gpt-5-mini",
-        messages=[
-            {"role": "system", "content": "You are a professional news anchor writer."},
-            {"role": "user", "content": prompt}
-        ]
-    )
+    bucket_name = "podcast-episodes"
+    storage_filename = f"{timestamp}.mp3"
 
-    script = response.choices[0].message.content.strip()
-    print(f"✓ Script generated ({len(script)} characters)")
-    return script
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=16)
+    disk_queue = SimpleQueue()
+    done = object()
 
+    # Open the ElevenLabs connection while the first sentence is still being
+    # written, so the first TTS request skips the TCP/TLS handshake
+    prewarm = asyncio.create_task(asyncio.to_thread(elevenlabs_client.voices.get, VOICE_ID))
 
-def generate_audio(script):
-    """Convert script to audio using ElevenLabs"""
-    print("🎙️ Generating audio with ElevenLabs...")
+    def write_local():
+        # The local copy is written by its own thread, so a slow disk never
+        # holds up reading the next chunk from ElevenLabs
+        with open(audio_file, "wb", buffering=1 << 16) as f:
+            while (chunk := disk_queue.get()) is not done:
+                f.write(chunk)
 
-    # Save to file
-    output_dir = Path(__file__).parent / "news-report" / "audio-data"
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    audio_file = output_dir / f"news_podcast_{timestamp}.mp3"
-
-    # Generate audio using correct API
-    audio_stream = elevenlabs_client.text_to_speech.convert(
-        text=script,
-        voice_id="UgBBYS2sOqTuMpoF3BR0",  # Professional male voice
-        model_id="eleven_multilingual_v2",
-        output_format="mp3_44100_128"
-    )
-
-    # Write audio chunks to file
-    with open(audio_file, "wb") as f:
+    def produce(text):
+        # The ElevenLabs SDK yields from a blocking generator, so it runs in a
+        # worker thread and hands chunks to the upload body through the queue
+        audio_stream = elevenlabs_client.text_to_speech.stream(
+            text=text,
+            voice_id=VOICE_ID,
+            model_id=MODEL_ID,
+            output_format=OUTPUT_FORMAT,
+            optimize_streaming_latency=TTS_LATENCY
+        )
         for chunk in audio_stream:
             if chunk:
-                f.write(chunk)
+                disk_queue.put(chunk)
+                asyncio.run_coroutine_threadsafe(queue.put(chunk), loop).result()
+
+    async def synthesize():
+        writer = loop.run_in_executor(None, write_local)
+        try:
+            # No TTS cache here, so every sentence may be batched
+            async with aclosing(batch_sentences(sentences, lambda text: False, chunk_chars)) as batches:
+                async for text in batches:
+                    await loop.run_in_executor(None, produce, text)
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            disk_queue.put(done)
+            await writer
+            await queue.put(done)
+
+    drained = False
+    audio_size = 0
+
+    async def body():
+        nonlocal drained, audio_size
+        while (item := await queue.get()) is not done:
+            if isinstance(item, Exception):
+                raise item
+            if not audio_size:
+                print(f"⏱ Time to first audio: {time.monotonic() - started:.2f}s")
+            audio_size += len(item)
+            yield item
+        drained = True
+
+    started = time.monotonic()
+    producer = asyncio.create_task(synthesize())
+    try:
+        # The multipart form is sent as a chunked body, so the upload
+        # finishes about one round trip after the last audio chunk
+        content_type, form = multipart_file(body(), storage_filename)
+        response = await http_client.post(
+            f"/api/storage/buckets/{bucket_name}/objects/{storage_filename}",
+            headers={"Content-Type": content_type},
+            content=form
+        )
+    finally:
+        # Let the producer finish the local copy even if the upload failed
+        while not drained:
+            item = await queue.get()
+            drained = item is done
+            if isinstance(item, bytes):
+                audio_size += len(item)
+        await producer
+        try:
+            await prewarm
+        except Exception as e:
+            print(f"⚠️ ElevenLabs pre-warm failed: {e}")
 
-    file_size_mb = audio_file.stat().st_size / (1024 * 1024)
     print(f"✓ Audio generated: {audio_file}")
-    print(f"  File size: {file_size_mb:.2f} MB")
+    print(f"  File size: {audio_size / (1024 * 1024):.2f} MB")
 
-    return audio_file
-
-
-async def upload_to_storage(file_path):
-    """Upload audio file to InsForge Storage"""
-    print("☁️ Uploading to InsForge Storage...")
-
-    import httpx
-
-    bucket_name = "podcast-episodes"
-    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    storage_filename = f"{timestamp}.mp3"
-
-    headers = {
-        "apikey": INSFORGE_API_KEY,
-        "Authorization": f"Bearer {INSFORGE_API_KEY}",
-    }
-
-    with file_path.open("rb") as f:
-        files = {"file": (storage_filename, f, "audio/mpeg")}
-
-        async with httpx.AsyncClient(timeout=120.0) as http_client:
-            response = await http_client.post(
-                f"{INSFORGE_BASE_URL}/api/storage/buckets/{bucket_name}/objects/{storage_filename}",
-                headers=headers,
-                files=files
-            )
-
-            if response.status_code not in [200, 201]:
-                print(f"⚠️ Upload failed: {response.status_code} - {response.text}")
-                print(f"Local file available at: {file_path}")
-                return None
+    if response.status_code not in [200, 201]:
+        print(f"⚠️ Upload failed: {response.status_code} - {response.text}")
+        print(f"Local file available at: {audio_file}")
+        return audio_file, None
 
     public_url = f"{INSFORGE_BASE_URL}/api/storage/buckets/{bucket_name}/objects/{storage_filename}"
     print(f"✓ Uploaded to {public_url}")
-    return public_url
+    return audio_file, public_url
 
 
 async def main():
@@ -200,19 +227,15 @@ async def main():
 
     print(f"\n✓ Using {len(articles)} articles from database")
 
-    # Step 1: Generate script
-    print("\n📝 Step 1: Generating script...")
-    script = await generate_script(articles)
+    # Steps 1 + 2: Stream the script sentence by sentence into TTS, and the
+    # audio into storage, so all three run at the same time
+    print("\n📝 Step 1+2: Generating script, audio and upload together...")
+    parts = []
+    sentences = record_sentences(stream_script_sentences(openai_client, articles, SYSTEM_MESSAGE), parts)
+    audio_file, audio_url = await generate_and_upload_audio(sentences)
+    script = "".join(parts).strip()
     print(f"\nScript Preview:\n{script[:300]}...\n")
 
-    # Step 2: Generate audio
-    print("🎙️ Step 2: Generating audio...")
-    audio_file = generate_audio(script)
-
-    # Step 3: Upload to storage
-    print("\n☁️ Step 3: Uploading to storage...")
-    audio_url = await upload_to_storage(audio_file)
-
     # Summary
     print("\n" + "=" * 60)
     print("✅ PODCAST EPISODE GENERATED!")
@@ -223,6 +246,8 @@ async def main():
         print(f"Public URL: {audio_url}")
     print(f"\n🎧 Play locally: open {audio_file}")
 
+    await http_client.aclose()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
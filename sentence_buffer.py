@@ -0,0 +1,72 @@
+"""
+Sentence aggregator for streamed LLM output.
+
+Tokens arrive a few characters at a time; TTS wants whole sentences.
+SentenceBuffer collects the tokens and releases each sentence once its
+terminator and the following whitespace have arrived, without splitting on
+abbreviations ("Dr. Smith", "U.S. Senate") or emitting tiny fragments
+that would sound clipped when synthesized alone.
+"""
+
+import re
+
+# Sentence terminator followed by whitespace
+_BOUNDARY = re.compile(r'[.!?]\s')
+
+# Words that end with a period without ending the sentence (compared lowercased, without the period)
+ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "gen", "gov", "sen", "rep", "rev",
+    "vs", "etc", "inc", "corp", "ltd", "co", "no", "jan", "feb", "aug", "sept", "oct", "nov", "dec",
+    "u.s", "u.k", "u.n", "e.g", "i.e",
+})
+
+
+class SentenceBuffer:
+    """Accumulate streamed text and split it into sentences of at least `min_length` characters"""
+
+    def __init__(self, min_length=10):
+        self.min_length = min_length
+        self._buffer = ""
+        self._scan_from = 0
+
+    def feed(self, text):
+        """Add `text` and return the sentences it completed"""
+        self._buffer += text
+        sentences = []
+        start, pos = 0, self._scan_from
+        while (match := _BOUNDARY.search(self._buffer, pos)):
+            pos = match.end()
+            if self._is_abbreviation(self._buffer[start:match.start() + 1]):
+                continue
+            if len(self._buffer[start:pos].strip()) < self.min_length:
+                continue
+            sentences.append(self._buffer[start:pos])
+            start = pos
+
+        # Boundaries before `pos` were already rejected; don't re-check them
+        self._buffer = self._buffer[start:]
+        self._scan_from = pos - start
+        return sentences
+
+    def flush(self):
+        """Return whatever text is left (the unterminated tail) and reset"""
+        rest, self._buffer, self._scan_from = self._buffer, "", 0
+        return rest
+
+    @staticmethod
+    def _is_abbreviation(text):
+        if not text.endswith("."):
+            return False
+        word = text.rsplit(None, 1)[-1][:-1].lstrip("(\"'").lower()
+        # Single letters are initials ("John F. Kennedy")
+        return word in ABBREVIATIONS or (len(word) == 1 and word.isalpha())
+
+
+def split_sentences(text, min_length=10):
+    """Split a complete text into sentences with the same rules as SentenceBuffer"""
+    buffer = SentenceBuffer(min_length)
+    sentences = buffer.feed(text)
+    rest = buffer.flush()
+    if rest.strip():
+        sentences.append(rest)
+    return sentences
@@ -3,75 +3,233 @@
 Simple working podcast API that uses raw SQL via MCP
 Run this alongside your static file server
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import ORJSONResponse, Response
+from fastapi.staticfiles import StaticFiles
+from dataclasses import dataclass
+import gzip
+import hashlib
+import orjson
 import os
+import time
 from pathlib import Path
 
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
+
+# CORS middleware. Concrete origins (comma-separated FRONTEND_ORIGINS) let
+# the middleware use fixed headers instead of echoing each request's Origin,
+# and the API only serves reads
+FRONTEND_ORIGINS = os.getenv("FRONTEND_ORIGINS", "http://localhost:8000").split(",")
 
-# CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=[origin.strip() for origin in FRONTEND_ORIGINS],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET"],
+    allow_headers=["Accept", "Content-Type", "Range"],
 )
 
-# Mock episode data (from InsForge DB)
-EPISODES = [{
-    "id": "2f679026-497f-4891-85f5-9a659b2edee2",
-    "title": "Daily Brief - October 26, 2025",
-    "description": "Your daily AI-generated neutral news podcast covering the latest in tech, science, and space exploration",
-    "publication_date": "2025-10-26",
-    "audio_url": "http://localhost:3001/audio/podcast_20251026_011221.mp3",
-    "duration_seconds": 249,
-    "cover_image_url": "https://images.unsplash.com/photo-1478737270239-2f02b77fc618?w=800",
-    "play_count": 0
-}]
-
-@app.get("/api/podcasts")
-async def get_podcasts(limit: int = 10):
+class ReadOnlyMiddleware:
+    """Reject anything but reads before it reaches CORS or routing.
+
+    Every route serves GET and HEAD, so other methods get a 405, and requests
+    with a chunked body or one over `max_request_body` bytes get a 413.
+    OPTIONS passes through so CORS preflight still works.
+    """
+
+    allowed_methods = frozenset({"GET", "HEAD", "OPTIONS"})
+    max_request_body = 1024
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            response = None
+            if scope["method"] not in self.allowed_methods:
+                response = ORJSONResponse({"error": "method not allowed"}, status_code=405, headers={"Allow": "GET, HEAD"})
+            else:
+                headers = dict(scope["headers"])
+                length = headers.get(b"content-length", b"0")
+                if b"transfer-encoding" in headers or not length.isdigit() or int(length) > self.max_request_body:
+                    response = ORJSONResponse({"error": "request body too large"}, status_code=413)
+            if response is not None:
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+# Added last, so it is the outermost layer
+app.add_middleware(ReadOnlyMiddleware)
+
+@dataclass(frozen=True, slots=True)
+class Episode:
+    id: str
+    title: str
+    description: str
+    publication_date: str
+    audio_url: str
+    duration_seconds: int
+    cover_image_url: str
+    play_count: int
+
+# Mock episode data (from InsForge DB). A tuple of frozen records, so it can
+# be serialized once at import and shared read-only by every request
+EPISODES = (
+    Episode(
+        id="2f679026-497f-4891-85f5-9a659b2edee2",
+        title="Daily Brief - October 26, 2025",
+        description="Your daily AI-generated neutral news podcast covering the latest in tech, science, and space exploration",
+        publication_date="2025-10-26",
+        audio_url="http://localhost:3001/audio/podcast_20251026_011221.mp3",
+        duration_seconds=249,
+        cover_image_url="https://images.unsplash.com/photo-1478737270239-2f02b77fc618?w=800",
+        play_count=0
+    ),
+)
+
+JSON_MAX_AGE = 60
+
+def _preserialize(payload):
+    """Encode `payload` once, with a gzipped copy (None when gzip doesn't
+    shrink it) and its ETag"""
+    body = orjson.dumps(payload)
+    gzipped = gzip.compress(body, compresslevel=9, mtime=0)
+    # Weak, since the same content goes out plain or gzipped
+    etag = f'W/"{hashlib.md5(body, usedforsecurity=False).hexdigest()}"'
+    return body, gzipped if len(gzipped) < len(body) else None, etag
+
+# Every response body is encoded (and compressed) at import, so requests
+# never pay for orjson or gzip. Any limit yields a prefix of EPISODES, so
+# the list bodies are keyed by prefix length
+_PRESERIALIZED = {
+    n: _preserialize({"episodes": EPISODES[:n], "count": len(EPISODES)})
+    for n in range(len(EPISODES) + 1)
+}
+_LATEST = _preserialize(
+    {"episode": EPISODES[0], "found": True} if EPISODES
+    else {"episode": None, "found": False, "message": "No episodes available"}
+)
+
+def _accepts_gzip(request):
+    """True if Accept-Encoding allows gzip, by name or through *, with q > 0"""
+    weights = {}
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, *params = coding.split(";")
+        q = next((p.strip()[2:] for p in params if p.strip().lower().startswith("q=")), "1")
+        try:
+            weights[name.strip().lower()] = float(q)
+        except ValueError:
+            continue
+    return weights.get("gzip", weights.get("*", 0)) > 0
+
+def _json_response(preserialized, request):
+    """Send a pre-encoded body, gzipped when the client accepts it, or an
+    empty 304 to clients that already have its ETag"""
+    body, gzipped, etag = preserialized
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={JSON_MAX_AGE}"}
+    if gzipped is not None:
+        headers["Vary"] = "Accept-Encoding"
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match == "*" or etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    if gzipped is not None and _accepts_gzip(request):
+        headers["Content-Encoding"] = "gzip"
+        body = gzipped
+    return Response(body, media_type="application/json", headers=headers)
+
+@app.api_route("/api/podcasts", methods=["GET", "HEAD"])
+async def get_podcasts(request: Request, limit: int = 10):
     """Get list of podcast episodes"""
-    return {
-        "episodes": EPISODES[:limit],
-        "count": len(EPISODES)
-    }
+    # range slicing gives the prefix length (negative limits included) without copying EPISODES
+    return _json_response(_PRESERIALIZED[len(range(len(EPISODES))[:limit])], request)
 
-@app.get("/api/podcasts/latest")
-async def get_latest_podcast():
+@app.api_route("/api/podcasts/latest", methods=["GET", "HEAD"])
+async def get_latest_podcast(request: Request):
     """Get today's podcast episode"""
-    if EPISODES:
-        return {
-            "episode": EPISODES[0],
-            "found": True
-        }
-    return {
-        "episode": None,
-        "found": False,
-        "message": "No episodes available"
-    }
-
-@app.get("/audio/{filename}")
-async def serve_audio(filename: str):
-    """Serve audio files"""
-    audio_path = Path(__file__).parent / "public" / "audio" / filename
-
-    if audio_path.exists():
-        return FileResponse(
-            audio_path,
-            media_type="audio/mpeg",
-            headers={"Accept-Ranges": "bytes"}
-        )
-
-    return {"error": "File not found"}, 404
-
-@app.get("/health")
-async def health():
-    return {"status": "ok", "service": "simple-podcast-api"}
+    return _json_response(_LATEST, request)
+
+# Audio files are served by StaticFiles: it resolves paths safely inside
+# AUDIO_DIR, sets Content-Type from the extension, answers conditional
+# requests and reads the file off the event loop.
+# Range requests get 206 partial content (Starlette >= 0.39), so seeking in
+# the player fetches only the window it needs instead of the whole MP3
+AUDIO_DIR = (Path(__file__).parent / "public" / "audio").resolve()
+AUDIO_RESCAN_SECONDS = 60
+# Each read is a thread hop (anyio file I/O), so stream audio in 1 MiB reads
+# rather than Starlette's default 64 KiB
+AUDIO_CHUNK_SIZE = 1 << 20
+# Episode files are never rewritten under the same name
+AUDIO_MAX_AGE = 86400
+
+class AudioFiles(StaticFiles):
+    """StaticFiles limited to the MP3s found in AUDIO_DIR.
+
+    The directory listing is cached and rescanned at most every
+    AUDIO_RESCAN_SECONDS, so unknown names are rejected with a set lookup
+    instead of a filesystem stat.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._known = frozenset()
+        self._scanned_at = float("-inf")
+
+    def known_files(self):
+        now = time.monotonic()
+        if now - self._scanned_at >= AUDIO_RESCAN_SECONDS:
+            self._known = frozenset(p.name for p in AUDIO_DIR.glob("*.mp3"))
+            self._scanned_at = now
+        return self._known
+
+    async def get_response(self, path, scope):
+        if path not in self.known_files():
+            raise HTTPException(status_code=404)
+        return await super().get_response(path, scope)
+
+    def file_response(self, *args, **kwargs):
+        response = super().file_response(*args, **kwargs)
+        response.chunk_size = AUDIO_CHUNK_SIZE
+        # StaticFiles already sends ETag / Last-Modified and answers 304s
+        response.headers["Cache-Control"] = f"public, max-age={AUDIO_MAX_AGE}"
+        return response
+
+app.mount("/audio", AudioFiles(directory=AUDIO_DIR, check_dir=False), name="audio")
+
+class HealthCheck:
+    """Bare ASGI health probe wrapped around the whole app: GET/HEAD /health
+    gets a fixed pre-encoded body before any middleware, routing or
+    serialization runs; everything else goes to `app`"""
+
+    body = orjson.dumps({"status": "ok", "service": "simple-podcast-api"})
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] == "/health" and scope["method"] in ("GET", "HEAD"):
+            await send({"type": "http.response.start", "status": 200, "headers": self.headers})
+            await send({"type": "http.response.body", "body": self.body})
+            return
+        await self.app(scope, receive, send)
+
+# The ASGI entry point served by uvicorn
+server = HealthCheck(app)
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=3001)
+    # Single-process dev server; start-podcast-api.sh runs the multi-worker
+    # Gunicorn deployment. "auto" picks uvloop + httptools when installed;
+    # per-request access logging is off since it costs more than these
+    # handlers do
+    uvicorn.run(
+        "simple-podcast-api:server",
+        host="0.0.0.0",
+        port=3001,
+        loop="auto",
+        http="auto",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        log_level="warning",
+        access_log=False
+    )
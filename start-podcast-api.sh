@@ -0,0 +1,18 @@
+#!/bin/bash
+# Production launcher for simple-podcast-api.py
+# Gunicorn supervises UvicornWorker processes, one event loop per worker.
+# EPISODES and the pre-encoded bodies are read-only, so every worker serves
+# from its own copy. WEB_CONCURRENCY overrides the 2n+1 worker default.
+
+set -e  # Exit on error
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+cd "$SCRIPT_DIR"
+
+exec gunicorn simple-podcast-api:server \
+    -k uvicorn.workers.UvicornWorker \
+    -w "${WEB_CONCURRENCY:-$((2 * $(nproc) + 1))}" \
+    --bind "0.0.0.0:${PORT:-3001}" \
+    --keep-alive 5 \
+    --worker-connections 1000 \
+    --log-level warning